@@ -1,21 +1,71 @@
-from crewai import Crew
+from crewai import Crew, Task
 from textwrap import dedent
-from trip_planner.agents import TripAgents
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from trip_planner.agents import TripAgents, create_llm
 from trip_planner.tasks import TravelTasks
-from datetime import datetime
+from datetime import date
+from functools import lru_cache
 import sys
-from typing import Dict, List, Optional
+import argparse
+from typing import Callable, Dict, List, Optional
 import json
+import hashlib
+import orjson
 from dotenv import load_dotenv
 load_dotenv()
 import os
 from trip_planner.telemetry import setup_telemetry
+from trip_planner.llm_cache import MemoryCache
+
+TRIP_PLAN_CACHE_TTL = 6 * 60 * 60
+
+# Each task starts as soon as the tasks it depends on have finished
+TASK_DEPENDENCIES = {
+    "identify_city": [],
+    "gather_city_info": ["identify_city"],
+    "plan_transportation": ["identify_city"],
+    "find_accommodation": ["identify_city"],
+    "create_budget": ["identify_city"],
+    "plan_itinerary": [
+        "identify_city",
+        "gather_city_info",
+        "plan_transportation",
+        "find_accommodation",
+        "create_budget"
+    ]
+}
+
+# Upper bound on concurrent LLM-backed tasks, to stay within OpenAI rate limits
+MAX_PARALLEL_TASKS = 4
+
+# Weather and events go stale quickly; itineraries and budgets much less so
+TASK_CACHE_TTLS = {
+    "identify_city": 60 * 60,
+    "gather_city_info": 6 * 60 * 60,
+    "plan_transportation": 6 * 60 * 60,
+    "find_accommodation": 12 * 60 * 60,
+    "create_budget": 24 * 60 * 60,
+    "plan_itinerary": 24 * 60 * 60
+}
+
+TASK_EXPECTED_OUTPUTS = {
+    "identify_city": "A ranked report of the candidate cities with scores, costs, weather and events.",
+    "gather_city_info": "An in-depth guide for each city covering customs, neighborhoods, food and transit.",
+    "plan_transportation": "Transportation options between the origin and each city with times and costs.",
+    "find_accommodation": "Accommodation recommendations for each city with price ranges and booking tips.",
+    "create_budget": "A detailed budget breakdown for the whole trip.",
+    "plan_itinerary": "A complete day-by-day travel itinerary."
+}
+
+exact_cache = MemoryCache(max_size_mb=256)
+# One cache per task, so a step can never be handed another step's output
+step_caches = {name: MemoryCache(max_size_mb=32) for name in TASK_DEPENDENCIES}
+
+@lru_cache(maxsize=128)
+def _parse_ymd(value: str) -> date:
+    """Parse a YYYY-MM-DD date, caching results across repeated submissions."""
+    return date.fromisoformat(value)
 
-# Initialize telemetry
-try:
-    tracer_provider = setup_telemetry()
-except Exception as e:
-    print(f"Warning: Failed to initialize telemetry: {str(e)}")
 
 class TripCrew:
     def __init__(self, origin: str, cities: List[str], date_range: Dict[str, str], 
@@ -26,6 +76,7 @@ class TripCrew:
         self.interests = interests
         self.budget = budget
         self._validate_inputs()
+        self._cache_key = self._exact_cache_key()
 
     def _validate_inputs(self):
         """Validate all input parameters."""
@@ -39,8 +90,8 @@ class TripCrew:
             raise ValueError("Date range must include start and end dates")
         
         try:
-            start_date = datetime.strptime(self.date_range['start'], "%Y-%m-%d")
-            end_date = datetime.strptime(self.date_range['end'], "%Y-%m-%d")
+            start_date = _parse_ymd(self.date_range['start'])
+            end_date = _parse_ymd(self.date_range['end'])
             if end_date < start_date:
                 raise ValueError("End date must be after start date")
             if (end_date - start_date).days > 90:
@@ -54,11 +105,34 @@ class TripCrew:
         if self.budget is not None and self.budget <= 0:
             raise ValueError("Budget must be a positive number")
 
-    def run(self):
-        """Run the travel planning crew."""
+    def _exact_cache_key(self) -> str:
+        """Hash the normalized trip inputs for exact-match cache lookups.
+
+        Plans are only reused when every input matches, since trips that differ
+        only in a city, date or budget need different plans.
+        """
+        inputs = {
+            "origin": self.origin.strip().lower(),
+            "cities": [city.strip().lower() for city in self.cities],
+            "date_range": self.date_range,
+            "interests": [interest.strip().lower() for interest in self.interests],
+            "budget": self.budget
+        }
+        return hashlib.blake2b(json.dumps(inputs, sort_keys=True).encode()).hexdigest()
+
+    def run(self, on_step: Optional[Callable[[str, str], None]] = None):
+        """Run the travel planning crew, reusing the cached plan for an identical trip.
+
+        If given, on_step is called with each task's name and output as soon as that
+        task finishes, so callers can show partial results while later tasks run.
+        """
+        cached = exact_cache.get(self._cache_key)
+        if cached is not None:
+            return cached
+
         try:
             # Initialize agents and tasks
-            agents = TripAgents()
+            agents = TripAgents(create_llm())
             tasks = TravelTasks()
 
             # Create specialized agents
@@ -70,156 +144,244 @@ class TripCrew:
             budget_planner = agents.budget_planner()
 
             # Create tasks with all necessary information
-            plan_itinerary = tasks.plan_itinerary(
-                expert_travel_agent,
-                self.cities,
-                self.date_range,
-                self.interests,
-                self.budget
-            )
-
-            identify_city = tasks.identify_city(
-                city_selection_expert,
-                self.origin,
-                self.cities,
-                self.interests,
-                self.date_range,
-                self.budget
-            )
-
-            gather_city_info = tasks.gather_city_info(
-                local_tour_guide,
-                self.cities,
-                self.date_range,
-                self.interests
-            )
-
-            plan_transportation = tasks.plan_transportation(
-                transportation_specialist,
-                self.origin,
-                self.cities,
-                self.date_range
-            )
-
-            find_accommodation = tasks.find_accommodation(
-                accommodation_expert,
-                self.cities,
-                self.date_range,
-                self.budget
-            )
-
-            create_budget = tasks.create_budget(
-                budget_planner,
-                self.cities,
-                self.date_range,
-                self.interests,
-                self.budget
-            )
-
-            # Create and run the crew
-            crew = Crew(
-                agents=[
-                    expert_travel_agent,
-                    city_selection_expert,
-                    local_tour_guide,
-                    transportation_specialist,
-                    accommodation_expert,
-                    budget_planner
-                ],
-                tasks=[
-                    identify_city,
-                    gather_city_info,
-                    plan_transportation,
-                    find_accommodation,
-                    create_budget,
-                    plan_itinerary
-                ],
-                verbose=True,
-            )
-
-            result = crew.kickoff()
-            return self._format_result(result)
+            steps = {
+                "identify_city": {
+                    "agent": city_selection_expert,
+                    "description": tasks.identify_city(
+                        city_selection_expert,
+                        self.origin,
+                        self.cities,
+                        self.interests,
+                        self.date_range,
+                        self.budget
+                    ),
+                    "inputs": [self.origin, self.cities, self.interests, self.date_range, self.budget]
+                },
+                "gather_city_info": {
+                    "agent": local_tour_guide,
+                    "description": tasks.gather_city_info(
+                        local_tour_guide,
+                        self.cities,
+                        self.date_range,
+                        self.interests
+                    ),
+                    "inputs": [self.cities, self.date_range, self.interests]
+                },
+                "plan_transportation": {
+                    "agent": transportation_specialist,
+                    "description": tasks.plan_transportation(
+                        transportation_specialist,
+                        self.origin,
+                        self.cities,
+                        self.date_range
+                    ),
+                    "inputs": [self.origin, self.cities, self.date_range]
+                },
+                "find_accommodation": {
+                    "agent": accommodation_expert,
+                    "description": tasks.find_accommodation(
+                        accommodation_expert,
+                        self.cities,
+                        self.date_range,
+                        self.budget
+                    ),
+                    "inputs": [self.cities, self.date_range, self.budget]
+                },
+                "create_budget": {
+                    "agent": budget_planner,
+                    "description": tasks.create_budget(
+                        budget_planner,
+                        self.cities,
+                        self.date_range,
+                        self.interests,
+                        self.budget
+                    ),
+                    "inputs": [self.cities, self.date_range, self.interests, self.budget]
+                },
+                "plan_itinerary": {
+                    "agent": expert_travel_agent,
+                    "description": tasks.plan_itinerary(
+                        expert_travel_agent,
+                        self.cities,
+                        self.date_range,
+                        self.interests,
+                        self.budget
+                    ),
+                    "inputs": [self.origin, self.cities, self.date_range, self.interests, self.budget]
+                }
+            }
+
+            outputs = self._run_pipeline(steps, on_step)
+            result = self._format_result(outputs["plan_itinerary"])
+            exact_cache.set(self._cache_key, result, ttl=TRIP_PLAN_CACHE_TTL)
+            return result
 
         except Exception as e:
             print(f"Error during travel planning: {str(e)}")
             raise
 
+    def _run_pipeline(self, steps: Dict[str, Dict],
+                      on_step: Optional[Callable[[str, str], None]] = None) -> Dict[str, str]:
+        """Run the tasks in dependency order, executing independent tasks concurrently."""
+        outputs = {}
+        pending = dict(TASK_DEPENDENCIES)
+        running = {}
+        with ThreadPoolExecutor(max_workers=MAX_PARALLEL_TASKS) as executor:
+            while pending or running:
+                for name, dependencies in list(pending.items()):
+                    if all(dependency in outputs for dependency in dependencies):
+                        upstream = {dependency: outputs[dependency] for dependency in dependencies}
+                        future = executor.submit(self._run_step, name, steps[name], upstream)
+                        running[future] = name
+                        del pending[name]
+
+                if not running:
+                    raise ValueError(f"Unresolvable task dependencies: {sorted(pending)}")
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    outputs[name] = future.result()
+                    if on_step is not None:
+                        on_step(name, outputs[name])
+
+        return outputs
+
+    def _run_step(self, name: str, step: Dict, upstream: Dict[str, str]) -> str:
+        """Run a single task as its own crew, reusing cached output for identical inputs."""
+        cache = step_caches[name]
+        # Upstream outputs go into the prompt, so they are part of the key too
+        payload = json.dumps([step["inputs"], upstream], sort_keys=True)
+        cache_key = hashlib.blake2b(payload.encode()).hexdigest()
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        description = step["description"]
+        if upstream:
+            context = "\n\n".join(f"## {dependency}\n{output}" for dependency, output in upstream.items())
+            description = f"{description}\n\nResults from earlier planning steps:\n\n{context}"
+
+        task = Task(
+            description=description,
+            expected_output=TASK_EXPECTED_OUTPUTS[name],
+            agent=step["agent"]
+        )
+        crew = Crew(agents=[step["agent"]], tasks=[task], verbose=True)
+        result = crew.kickoff()
+        output = result.raw if hasattr(result, "raw") else str(result)
+
+        cache.set(cache_key, output, ttl=TASK_CACHE_TTLS[name])
+        return output
+
     def _format_result(self, result: str) -> Dict:
         """Format the result into a structured dictionary."""
         try:
             # Try to parse the result as JSON if it's in JSON format
-            return json.loads(result)
-        except json.JSONDecodeError:
+            return orjson.loads(result)
+        except orjson.JSONDecodeError:
             # If not JSON, return as a formatted string
             return {"itinerary": result}
 
 
-def get_user_input() -> Dict:
-    """Get and validate user input for travel planning."""
+def _read_cli_input() -> Dict:
+    """Prompt for the raw trip details on the command line."""
     print("\n## Welcome to Trip Planner Crew")
     print('-------------------------------')
     
-    # Get origin
-    origin = input(dedent("""
+    return {
+        "origin": input(dedent("""
     From where will you be traveling from?
-    """)).strip()
-    
-    # Get cities
-    cities_input = input(dedent("""
+    """)),
+        "cities": input(dedent("""
     What are the cities you are interested in visiting? (comma-separated)
-    """)).strip()
-    cities = [city.strip() for city in cities_input.split(',')]
-    
-    # Get date range
-    start_date = input(dedent("""
+    """)),
+        "start_date": input(dedent("""
     What is your start date? (YYYY-MM-DD)
-    """)).strip()
-    end_date = input(dedent("""
+    """)),
+        "end_date": input(dedent("""
     What is your end date? (YYYY-MM-DD)
-    """)).strip()
-    
-    # Get interests
-    interests_input = input(dedent("""
+    """)),
+        "interests": input(dedent("""
     What are your interests and hobbies? (comma-separated)
-    """)).strip()
-    interests = [interest.strip() for interest in interests_input.split(',')]
-    
-    # Get budget
-    budget_input = input(dedent("""
+    """)),
+        "budget": input(dedent("""
     What is your budget in USD? (press Enter to skip)
-    """)).strip()
-    budget = float(budget_input) if budget_input else None
+    """))
+    }
+
+
+def _split_list(value) -> List[str]:
+    """Split a comma-separated string (or clean a list) into stripped items."""
+    if isinstance(value, str):
+        value = value.split(',')
+    return [item.strip() for item in value if item.strip()]
+
+
+def parse_user_input(raw: Dict) -> Dict:
+    """Convert raw trip details from the CLI, a JSON file or a form into TripCrew arguments."""
+    budget = raw.get("budget")
+    if isinstance(budget, str):
+        budget = budget.strip() or None
     
     return {
-        "origin": origin,
-        "cities": cities,
+        "origin": str(raw.get("origin", "")).strip(),
+        "cities": _split_list(raw.get("cities", [])),
         "date_range": {
-            "start": start_date,
-            "end": end_date
+            "start": str(raw.get("start_date", "")).strip(),
+            "end": str(raw.get("end_date", "")).strip()
         },
-        "interests": interests,
-        "budget": budget
+        "interests": _split_list(raw.get("interests", [])),
+        "budget": float(budget) if budget is not None else None
     }
 
 
+def parse_and_validate(raw: Dict) -> TripCrew:
+    """Parse raw trip details and build a validated TripCrew."""
+    return TripCrew(**parse_user_input(raw))
+
+
+def print_step(name: str, output: str):
+    """Print a finished planning step while the remaining steps run."""
+    print(f"\n## Finished {name.replace('_', ' ')}\n")
+    print(output)
+
+
 def save_itinerary(itinerary: Dict, filename: str = "trip_plan.json"):
     """Save the itinerary to a JSON file."""
     try:
-        with open(filename, 'w') as f:
-            json.dump(itinerary, f, indent=2)
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(itinerary, option=orjson.OPT_INDENT_2))
         print(f"\nItinerary saved to {filename}")
     except Exception as e:
         print(f"Error saving itinerary: {str(e)}")
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Plan a trip with the Trip Planner Crew")
+    parser.add_argument(
+        "--input",
+        help="JSON file with origin, cities, start_date, end_date, interests and budget"
+    )
+    args = parser.parse_args()
+
+    # Initialize telemetry only when run as the CLI, not when imported
+    try:
+        setup_telemetry()
+    except Exception as e:
+        print(f"Warning: Failed to initialize telemetry: {str(e)}")
+
     try:
         # Get user input
-        user_input = get_user_input()
+        if args.input:
+            with open(args.input, 'rb') as f:
+                user_input = orjson.loads(f.read())
+        else:
+            user_input = _read_cli_input()
         
         # Create and run trip crew
-        trip_crew = TripCrew(**user_input)
-        result = trip_crew.run()
+        trip_crew = parse_and_validate(user_input)
+        result = trip_crew.run(on_step=print_step)
         
         # Display results
         print("\n########################")
@@ -0,0 +1,54 @@
+import pytest
+
+from trip_planner.guardrails import GuardrailManager, OutputGuardrails
+
+
+def _plan(**overrides):
+    plan = {
+        "destination": "Lisbon",
+        "itinerary": [
+            {"day": 1, "date": "2030-05-01", "activities": [], "meals": []}
+        ],
+        "budget_breakdown": {
+            "accommodation": 500,
+            "food": 300,
+            "activities": 400,
+            "transportation": 200,
+            "total": 1400
+        },
+        "recommendations": ["Book trams early"]
+    }
+    plan.update(overrides)
+    return plan
+
+
+def test_valid_travel_plan_passes():
+    assert OutputGuardrails.validate_travel_plan(_plan())
+    assert GuardrailManager().validate_output(_plan(), "travel_plan") == (True, None)
+
+
+@pytest.mark.parametrize("plan", [
+    _plan(itinerary=["x"]),
+    _plan(itinerary=None),
+    _plan(itinerary="day one"),
+    _plan(itinerary=[{"day": 1, "date": "2030-05-01"}]),
+    _plan(budget_breakdown="x"),
+    _plan(budget_breakdown={"total": 1400}),
+    {"itinerary": [], "budget_breakdown": {}},
+    ["not", "a", "plan"],
+    "not a plan",
+    None,
+])
+def test_malformed_travel_plans_are_rejected(plan):
+    assert OutputGuardrails.validate_travel_plan(plan) is False
+    assert GuardrailManager().validate_output(plan, "travel_plan") == (False, "Invalid travel plan format")
+
+
+@pytest.mark.parametrize("city", ["Barcelona", None, ["name"], {"name": "Barcelona"}])
+def test_malformed_city_recommendations_are_rejected(city):
+    assert OutputGuardrails.validate_city_recommendation(city) is False
+
+
+def test_sensitive_content_anywhere_in_the_plan_is_rejected():
+    plan = _plan(recommendations=["Avoid the ILLEGAL street races"])
+    assert GuardrailManager().validate_output(plan, "travel_plan") == (False, "Output contains sensitive content")
@@ -0,0 +1,154 @@
+import threading
+
+import pytest
+import requests
+
+from trip_planner.tools import _http
+from trip_planner.tools._http import (
+    BREAKER_COOLDOWN,
+    BREAKER_THRESHOLD,
+    CircuitOpenError,
+)
+
+
+class _Clock:
+    """Stand-in for time.monotonic that only moves when told to"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class _Upstream:
+    """Fake transport behind the breaker: fails or answers with a status code"""
+
+    def __init__(self):
+        self.calls = []
+        self.fail = True
+        self.status_code = 200
+        # When set, requests block on it after signalling that they started
+        self.release = None
+        self.started = threading.Event()
+
+    def request(self, url, timeout=None):
+        self.calls.append((url, timeout))
+        if self.release is not None:
+            self.started.set()
+            self.release.wait(timeout=5)
+        if self.fail:
+            raise requests.ConnectionError("upstream down")
+        response = requests.Response()
+        response.status_code = self.status_code
+        return response
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    fake = _Upstream()
+    monkeypatch.setattr(
+        requests.Session, "request",
+        lambda _session, _method, url, **kwargs: fake.request(url, kwargs.get("timeout"))
+    )
+    return fake
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = _Clock()
+    monkeypatch.setattr(_http.time, "monotonic", fake)
+    return fake
+
+
+def _fail_times(session, url, times):
+    for _ in range(times):
+        with pytest.raises(requests.ConnectionError):
+            session.get(url)
+
+
+@pytest.mark.usefixtures("clock")
+def test_breaker_opens_after_consecutive_failures(upstream):
+    session = _http._BreakerSession()
+    _fail_times(session, "https://api.example.com/a", BREAKER_THRESHOLD)
+
+    with pytest.raises(CircuitOpenError):
+        session.get("https://api.example.com/b")
+    assert len(upstream.calls) == BREAKER_THRESHOLD
+
+
+@pytest.mark.usefixtures("clock")
+def test_breaker_is_per_host(upstream):
+    session = _http._BreakerSession()
+    _fail_times(session, "https://down.example.com/", BREAKER_THRESHOLD)
+
+    upstream.fail = False
+    assert session.get("https://up.example.com/").status_code == 200
+
+
+@pytest.mark.usefixtures("clock")
+def test_breaker_counts_server_errors_and_resets_on_success(upstream):
+    session = _http._BreakerSession()
+    upstream.fail = False
+    upstream.status_code = 503
+    for _ in range(BREAKER_THRESHOLD - 1):
+        session.get("https://api.example.com/")
+
+    upstream.status_code = 200
+    session.get("https://api.example.com/")
+    upstream.status_code = 503
+    for _ in range(BREAKER_THRESHOLD - 1):
+        session.get("https://api.example.com/")
+
+    # The success in between reset the count, so the circuit is still closed
+    assert session.get("https://api.example.com/").status_code == 503
+    with pytest.raises(CircuitOpenError):
+        session.get("https://api.example.com/")
+
+
+def test_breaker_half_opens_after_cooldown(upstream, clock):
+    session = _http._BreakerSession()
+    _fail_times(session, "https://api.example.com/", BREAKER_THRESHOLD)
+
+    clock.now += BREAKER_COOLDOWN + 1
+    # One probe goes through after the cooldown; its failure reopens the circuit at once
+    _fail_times(session, "https://api.example.com/", 1)
+    with pytest.raises(CircuitOpenError):
+        session.get("https://api.example.com/")
+
+    clock.now += BREAKER_COOLDOWN + 1
+    upstream.fail = False
+    assert session.get("https://api.example.com/").status_code == 200
+    assert session.get("https://api.example.com/").status_code == 200
+
+
+def test_half_open_circuit_lets_exactly_one_probe_through(upstream, clock):
+    session = _http._BreakerSession()
+    _fail_times(session, "https://api.example.com/", BREAKER_THRESHOLD)
+
+    clock.now += BREAKER_COOLDOWN + 1
+    upstream.fail = False
+    upstream.release = threading.Event()
+    probe = threading.Thread(target=session.get, args=("https://api.example.com/probe",))
+    probe.start()
+    assert upstream.started.wait(timeout=5)
+
+    # Other callers fail fast while the probe is in flight
+    with pytest.raises(CircuitOpenError):
+        session.get("https://api.example.com/other")
+
+    upstream.release.set()
+    probe.join(timeout=5)
+    assert [url for url, _ in upstream.calls][BREAKER_THRESHOLD:] == ["https://api.example.com/probe"]
+    # The successful probe closed the circuit
+    assert session.get("https://api.example.com/other").status_code == 200
+
+
+@pytest.mark.usefixtures("clock")
+def test_requests_default_to_the_tool_timeout(upstream):
+    session = _http._BreakerSession()
+    upstream.fail = False
+    session.get("https://api.example.com/")
+    session.get("https://api.example.com/", timeout=1)
+
+    assert [timeout for _, timeout in upstream.calls] == [_http.DEFAULT_TIMEOUT, 1]
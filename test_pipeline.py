@@ -0,0 +1,93 @@
+import threading
+
+import pytest
+
+import main
+from main import TASK_DEPENDENCIES, TripCrew
+
+
+def _trip() -> TripCrew:
+    return TripCrew(
+        origin="New York",
+        cities=["Lisbon"],
+        date_range={"start": "2030-05-01", "end": "2030-05-07"},
+        interests=["Food"],
+        budget=2000
+    )
+
+
+def test_pipeline_runs_each_task_after_its_dependencies(monkeypatch):
+    events = []
+    upstreams = {}
+    lock = threading.Lock()
+
+    def fake_run_step(_self, name, _step, upstream):
+        with lock:
+            events.append(("start", name))
+            upstreams[name] = upstream
+        with lock:
+            events.append(("end", name))
+        return f"{name} output"
+
+    monkeypatch.setattr(TripCrew, "_run_step", fake_run_step)
+    finished = []
+    outputs = _trip()._run_pipeline(
+        {name: {} for name in TASK_DEPENDENCIES},
+        on_step=lambda name, _output: finished.append(name)
+    )
+
+    assert outputs == {name: f"{name} output" for name in TASK_DEPENDENCIES}
+    assert sorted(finished) == sorted(TASK_DEPENDENCIES)
+    for name, dependencies in TASK_DEPENDENCIES.items():
+        started = events.index(("start", name))
+        for dependency in dependencies:
+            assert events.index(("end", dependency)) < started
+        assert upstreams[name] == {dependency: f"{dependency} output" for dependency in dependencies}
+
+
+def test_pipeline_runs_independent_tasks_concurrently(monkeypatch):
+    # The four fan-out tasks only finish once all of them have started together
+    fan_out = [name for name, deps in TASK_DEPENDENCIES.items() if deps == ["identify_city"]]
+    barrier = threading.Barrier(len(fan_out), timeout=5)
+
+    def fake_run_step(_self, name, _step, _upstream):
+        if name in fan_out:
+            barrier.wait()
+        return name
+
+    monkeypatch.setattr(main, "MAX_PARALLEL_TASKS", len(fan_out))
+    monkeypatch.setattr(TripCrew, "_run_step", fake_run_step)
+    outputs = _trip()._run_pipeline({name: {} for name in TASK_DEPENDENCIES})
+
+    assert set(outputs) == set(TASK_DEPENDENCIES)
+
+
+def test_pipeline_rejects_unresolvable_dependencies(monkeypatch):
+    monkeypatch.setattr(main, "TASK_DEPENDENCIES", {"a": ["b"], "b": ["a"]})
+    monkeypatch.setattr(TripCrew, "_run_step", lambda _self, name, _step, _upstream: name)
+
+    with pytest.raises(ValueError, match="Unresolvable task dependencies"):
+        _trip()._run_pipeline({"a": {}, "b": {}})
+
+
+def test_step_cache_keys_on_upstream_outputs(monkeypatch):
+    descriptions = []
+
+    class FakeCrew:
+        def __init__(self, tasks, **_kwargs):
+            self.tasks = tasks
+
+        def kickoff(self):
+            descriptions.append(self.tasks[0]["description"])
+            return f"output {len(descriptions)}"
+
+    monkeypatch.setattr(main, "Task", dict)
+    monkeypatch.setattr(main, "Crew", FakeCrew)
+    monkeypatch.setitem(main.step_caches, "plan_itinerary", main.MemoryCache(max_size_mb=1))
+    step = {"inputs": {"city": "Lisbon"}, "description": "Plan the trip", "agent": None}
+    trip = _trip()
+
+    first = trip._run_step("plan_itinerary", step, {"identify_city": "Lisbon"})
+    assert trip._run_step("plan_itinerary", step, {"identify_city": "Lisbon"}) == first
+    assert trip._run_step("plan_itinerary", step, {"identify_city": "Porto"}) != first
+    assert len(descriptions) == 2
@@ -0,0 +1,117 @@
+import pytest
+
+from trip_planner.tools import _cache
+from trip_planner.tools._cache import cached_call, cached_tool
+
+
+class _Clock:
+    """Stand-in for time.monotonic that only moves when told to"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_cached_call_keys_on_normalized_arguments():
+    calls = []
+
+    @cached_call()
+    def lookup(city, date=None):
+        calls.append((city, date))
+        return {"city": city}
+
+    lookup("Paris", date="2030-05-01")
+    lookup("  paris ", date="2030-05-01")
+    lookup("Paris", date="2030-06-01")
+    lookup("Lisbon", date="2030-05-01")
+
+    assert calls == [
+        ("Paris", "2030-05-01"),
+        ("Paris", "2030-06-01"),
+        ("Lisbon", "2030-05-01"),
+    ]
+
+
+def test_cached_call_keys_differ_per_function():
+    @cached_call()
+    def first(_value):
+        return "first"
+
+    @cached_call()
+    def second(_value):
+        return "second"
+
+    assert first("x") == "first"
+    assert second("x") == "second"
+
+
+def test_cached_call_expires_after_ttl(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(_cache.time, "monotonic", clock)
+    calls = []
+
+    @cached_call(ttl=60)
+    def lookup(city):
+        calls.append(city)
+        return len(calls)
+
+    assert lookup("Paris") == 1
+    clock.now += 59
+    assert lookup("Paris") == 1
+    clock.now += 2
+    assert lookup("Paris") == 2
+
+
+def test_cached_call_evicts_least_recently_used():
+    calls = []
+
+    @cached_call(maxsize=2)
+    def lookup(city):
+        calls.append(city)
+        return city
+
+    lookup("a")
+    lookup("b")
+    lookup("a")
+    lookup("c")  # evicts "b", the least recently used entry
+    lookup("a")
+    lookup("b")
+
+    assert calls == ["a", "b", "c", "b"]
+
+
+def test_cached_call_never_caches_exceptions_or_rejected_results():
+    results = iter([RuntimeError("down"), {"lat": 0, "lon": 0}, {"lat": 1, "lon": 2}])
+    calls = []
+
+    @cached_call(cache_if=lambda geo: bool(geo["lat"] or geo["lon"]))
+    def geocode(city):
+        calls.append(city)
+        result = next(results)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    with pytest.raises(RuntimeError):
+        geocode("Paris")
+    assert geocode("Paris") == {"lat": 0, "lon": 0}
+    assert geocode("Paris") == {"lat": 1, "lon": 2}
+    assert geocode("Paris") == {"lat": 1, "lon": 2}
+    assert len(calls) == 3
+
+
+def test_cached_tool_shares_results_across_instances_but_not_errors():
+    calls = []
+
+    class Tool:
+        @cached_tool()
+        def _run(self, query):
+            calls.append(query)
+            return "Error during search" if len(calls) == 1 else f"results for {query}"
+
+    assert Tool()._run("Barcelona").startswith("Error")
+    assert Tool()._run("Barcelona") == "results for Barcelona"
+    assert Tool()._run("barcelona") == "results for Barcelona"
+    assert calls == ["Barcelona", "Barcelona"]
@@ -1,4 +1,5 @@
 from .agents import TripAgents, TravelInput, CityInput
+from .llm_cache import MemoryCache
 from .tools import (
     CalculatorTool,
     SearchInternetTool,
@@ -10,6 +11,7 @@ from .tools import (
     RestaurantRecommendationsTool,
     AccommodationOptionsTool,
     MatchScoreTool,
+    MatchScoreBatchTool,
     GeocodeTool
 )
 
@@ -17,6 +19,7 @@ __all__ = [
     'TripAgents',
     'TravelInput',
     'CityInput',
+    'MemoryCache',
     'CalculatorTool',
     'SearchInternetTool',
     'TravelBudgetTool',
@@ -27,5 +30,6 @@ __all__ = [
     'RestaurantRecommendationsTool',
     'AccommodationOptionsTool',
     'MatchScoreTool',
+    'MatchScoreBatchTool',
     'GeocodeTool'
 ]
@@ -1,13 +1,15 @@
-from crewai import Agent, Task
+from crewai import Agent
 from textwrap import dedent
 from langchain_openai import ChatOpenAI
-import os
-from datetime import datetime
-import uuid
-import pandas as pd
-from typing import List, Dict, Any
-from pydantic import BaseModel, Field, validator
-from langchain.tools import Tool
+import functools
+from dataclasses import dataclass, field
+import math
+import httpx
+import litellm
+from datetime import date
+from typing import Annotated, List, Dict, Any, ClassVar, Literal, Union
+from annotated_types import Gt, Le, Len
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
 from trip_planner.tools.calculator_tools import CalculatorTool
 from trip_planner.tools.search_tools import SearchInternetTool
 from trip_planner.tools.travel_tools import (
@@ -19,156 +21,310 @@ from trip_planner.tools.travel_tools import (
     RestaurantRecommendationsTool,
     AccommodationOptionsTool,
     MatchScoreTool,
-    GeocodeTool
+    MatchScoreBatchTool
 )
 from trip_planner.guardrails import GuardrailManager
-from trip_planner.telemetry import setup_telemetry
 
+# One connection pool shared by every agent, so concurrent tasks reuse open
+# TLS connections instead of each paying for a new handshake.
+_HTTP_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=16)
+_shared_http_client = httpx.Client(limits=_HTTP_LIMITS)
+_shared_async_http_client = httpx.AsyncClient(limits=_HTTP_LIMITS)
 
-class TravelInput(BaseModel):
+# CrewAI sends agent requests through LiteLLM, which uses these sessions
+litellm.client_session = _shared_http_client
+litellm.aclient_session = _shared_async_http_client
+
+
+# Tools are stateless, so a single instance of each is shared by every agent
+_TOOLS = {
+    "search_internet": SearchInternetTool(),
+    "calculate": CalculatorTool(),
+    "weather_forecast": WeatherForecastTool(),
+    "local_events": LocalEventsTool(),
+    "travel_budget": TravelBudgetTool(),
+    "safety_info": SafetyInfoTool(),
+    "transportation_routes": TransportationRoutesTool(),
+    "restaurant_recommendations": RestaurantRecommendationsTool(),
+    "accommodation_options": AccommodationOptionsTool(),
+    "match_score": MatchScoreTool(),
+    "match_score_batch": MatchScoreBatchTool()
+}
+
+
+# Tool sets per agent; each Agent gets its own list in case CrewAI mutates it
+_EXPERT_TRAVEL_TOOLS = (
+    _TOOLS["search_internet"],
+    _TOOLS["weather_forecast"],
+    _TOOLS["local_events"],
+    _TOOLS["travel_budget"]
+)
+_CITY_SELECTION_TOOLS = (
+    _TOOLS["search_internet"],
+    _TOOLS["travel_budget"],
+    _TOOLS["safety_info"],
+    _TOOLS["match_score"],
+    _TOOLS["match_score_batch"]
+)
+_TOUR_GUIDE_TOOLS = (
+    _TOOLS["search_internet"],
+    _TOOLS["local_events"],
+    _TOOLS["restaurant_recommendations"]
+)
+_TRANSPORTATION_TOOLS = (
+    _TOOLS["search_internet"],
+    _TOOLS["calculate"],
+    _TOOLS["transportation_routes"],
+    _TOOLS["travel_budget"]
+)
+_ACCOMMODATION_TOOLS = (
+    _TOOLS["search_internet"],
+    _TOOLS["accommodation_options"],
+    _TOOLS["travel_budget"],
+    _TOOLS["safety_info"]
+)
+_FOOD_DINING_TOOLS = (
+    _TOOLS["search_internet"],
+    _TOOLS["restaurant_recommendations"],
+    _TOOLS["local_events"],
+    _TOOLS["travel_budget"]
+)
+_TRAVEL_PLANNING_TOOLS = (
+    _TOOLS["search_internet"],
+    _TOOLS["weather_forecast"],
+    _TOOLS["local_events"],
+    _TOOLS["travel_budget"]
+)
+_BUDGET_PLANNER_TOOLS = (
+    _TOOLS["search_internet"],
+    _TOOLS["calculate"]
+)
+
+
+# Structured output formats, built once rather than per agent construction
+_CITY_SELECTION_OUTPUT_FORMAT = {
+    "type": "json",
+    "schema": {
+        "recommended_cities": [
+            {
+                "name": "string",
+                "country": "string",
+                "description": "string",
+                "match_score": "number",
+                "highlights": ["string"],
+                "estimated_cost": {
+                    "accommodation": "number",
+                    "food": "number",
+                    "activities": "number",
+                    "total_per_day": "number"
+                }
+            }
+        ]
+    }
+}
+_TRAVEL_PLANNING_OUTPUT_FORMAT = {
+    "type": "json",
+    "schema": {
+        "itinerary": [
+            {
+                "day": "number",
+                "date": "string",
+                "activities": [
+                    {
+                        "time": "string",
+                        "activity": "string",
+                        "description": "string",
+                        "location": "string",
+                        "duration": "string",
+                        "cost": "number"
+                    }
+                ],
+                "meals": [
+                    {
+                        "time": "string",
+                        "type": "string",
+                        "suggestion": "string",
+                        "cost": "number"
+                    }
+                ]
+            }
+        ],
+        "budget_breakdown": {
+            "accommodation": "number",
+            "food": "number",
+            "activities": "number",
+            "transportation": "number",
+            "total": "number"
+        }
+    }
+}
+_BUDGET_PLANNER_OUTPUT_FORMAT = {
+    "type": "json",
+    "schema": {
+        "budget_breakdown": {
+            "accommodation": "number",
+            "food": "number",
+            "activities": "number",
+            "transportation": "number",
+            "total": "number"
+        }
+    }
+}
+
+
+def create_llm(**kwargs) -> ChatOpenAI:
+    """Create a ChatOpenAI client backed by the shared connection pool"""
+    kwargs.setdefault("model", "gpt-4-turbo-preview")
+    kwargs.setdefault("temperature", 0.7)
+    return ChatOpenAI(
+        http_client=_shared_http_client,
+        http_async_client=_shared_async_http_client,
+        **kwargs
+    )
+
+
+# Allowed values are enforced by pydantic-core through Literal types, without
+# a Python-level validator call per field
+Activity = Literal["Sightseeing", "Museums", "Shopping", "Local Food",
+                   "Adventure Sports", "Relaxation", "Nightlife"]
+AccommodationType = Literal["Budget", "Mid-range", "Luxury"]
+Preference = Literal["Beach", "Mountains", "City Life", "Culture", "Food",
+                     "Adventure", "Relaxation", "Nightlife"]
+Season = Literal["Spring", "Summer", "Fall", "Winter"]
+
+# Required keys for the budget breakdown returned by the agents
+_BUDGET_FIELDS = frozenset({"accommodation", "food", "activities", "transportation", "total"})
+
+
+class _JsonModel(BaseModel):
+    """Base model that can be validated straight from raw JSON"""
+
+    @classmethod
+    def from_json(cls, raw: Union[str, bytes]):
+        """Parse and validate raw JSON in one pass, without building an intermediate dict"""
+        return cls.model_validate_json(raw)
+
+
+class TravelInput(_JsonModel):
     """Input validation for travel planning requests"""
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     destination: str
     start_date: str
     end_date: str
-    activities: List[str] = Field(..., min_items=1)
-    accommodation: str
-
-    @validator('activities')
-    def validate_activities(cls, v):
-        allowed = {"Sightseeing", "Museums", "Shopping", "Local Food", 
-                  "Adventure Sports", "Relaxation", "Nightlife"}
-        if not all(act in allowed for act in v):
-            raise ValueError(f"Invalid activities. Allowed values: {allowed}")
-        return v
-
-    @validator('accommodation')
-    def validate_accommodation(cls, v):
-        allowed = {"Budget", "Mid-range", "Luxury"}
-        if v not in allowed:
-            raise ValueError(f"Invalid accommodation type. Allowed values: {allowed}")
-        return v
+    activities: Annotated[List[Activity], Len(min_length=1)]
+    accommodation: AccommodationType
 
-    @validator('end_date')
-    def validate_dates(cls, v, values):
-        if 'start_date' in values:
-            start = datetime.strptime(values['start_date'], "%Y-%m-%d")
-            end = datetime.strptime(v, "%Y-%m-%d")
-            if end < start:
-                raise ValueError("End date must be after start date")
-            if (end - start).days > 90:
-                raise ValueError("Trip duration cannot exceed 90 days")
-        return v
+    @model_validator(mode="after")
+    def validate_dates(self):
+        start = date.fromisoformat(self.start_date)
+        end = date.fromisoformat(self.end_date)
+        if end < start:
+            raise ValueError("End date must be after start date")
+        if (end - start).days > 90:
+            raise ValueError("Trip duration cannot exceed 90 days")
+        return self
 
 
-class TravelOutput(BaseModel):
+class TravelOutput(_JsonModel):
     """Output validation for travel planning responses"""
+    model_config = ConfigDict(frozen=True)
+
     itinerary: List[Dict[str, Any]]
     budget_breakdown: Dict[str, float]
     recommendations: List[str]
 
-    @validator('budget_breakdown')
+    @field_validator('budget_breakdown')
+    @classmethod
     def validate_budget(cls, v):
-        required = {"accommodation", "food", "activities", "transportation", "total"}
-        if not all(key in v for key in required):
-            raise ValueError(f"Budget breakdown must include: {required}")
-        if v['total'] != sum(v[k] for k in required if k != 'total'):
+        missing = _BUDGET_FIELDS.difference(v)
+        if missing:
+            raise ValueError(f"Budget breakdown must include: {sorted(missing)}")
+        expected = v['accommodation'] + v['food'] + v['activities'] + v['transportation']
+        if not math.isclose(v['total'], expected, rel_tol=1e-9, abs_tol=1e-6):
             raise ValueError("Total must equal sum of all costs")
         return v
 
+    @classmethod
+    def from_trusted(cls, data: Dict[str, Any]):
+        """Build from agent output whose schema was already enforced, skipping validation.
+
+        Nested values are kept as the plain dicts and lists they were parsed into.
+        """
+        return cls.model_construct(**data)
+
 
-class CityInput(BaseModel):
+class CityInput(_JsonModel):
     """Input validation for city selection requests"""
-    preferences: List[str] = Field(..., min_items=1)
-    budget: float = Field(..., gt=0, le=10000)
-    duration: int = Field(..., gt=0, le=90)
-    season: str
-
-    @validator('preferences')
-    def validate_preferences(cls, v):
-        allowed = {"Beach", "Mountains", "City Life", "Culture", "Food", 
-                  "Adventure", "Relaxation", "Nightlife"}
-        if not all(pref in allowed for pref in v):
-            raise ValueError(f"Invalid preferences. Allowed values: {allowed}")
-        return v
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
+    preferences: Annotated[List[Preference], Len(min_length=1)]
+    budget: Annotated[float, Gt(0), Le(10000)]
+    duration: Annotated[int, Gt(0), Le(90)]
+    season: Season
 
-    @validator('season')
-    def validate_season(cls, v):
-        allowed = {"Spring", "Summer", "Fall", "Winter"}
-        if v not in allowed:
-            raise ValueError(f"Invalid season. Allowed values: {allowed}")
-        return v
 
+class EstimatedCost(BaseModel):
+    """Estimated daily costs for a recommended city"""
+    model_config = ConfigDict(strict=True, frozen=True)
 
-class CityOutput(BaseModel):
+    accommodation: float
+    food: float
+    activities: float
+    total_per_day: float
+
+
+class RecommendedCity(BaseModel):
+    """A single city recommendation"""
+    model_config = ConfigDict(strict=True, frozen=True)
+
+    name: str
+    country: str
+    description: str
+    match_score: float
+    highlights: List[str]
+    estimated_cost: EstimatedCost
+
+
+class CityOutput(_JsonModel):
     """Output validation for city selection responses"""
-    recommended_cities: List[Dict[str, Any]] = Field(..., description="List of recommended cities with details")
-
-    @validator('recommended_cities')
-    def validate_cities(cls, v):
-        for city in v:
-            required_fields = {
-                "name", "country", "description", "match_score",
-                "highlights", "estimated_cost"
-            }
-            if not all(field in city for field in required_fields):
-                raise ValueError(f"Each city must include: {required_fields}")
-            
-            cost_fields = {
-                "accommodation", "food", "activities", "total_per_day"
-            }
-            if not all(field in city["estimated_cost"] for field in cost_fields):
-                raise ValueError(f"Each city's estimated_cost must include: {cost_fields}")
-            
-            if not isinstance(city["highlights"], list):
-                raise ValueError("highlights must be a list")
-            
-            if not isinstance(city["match_score"], (int, float)):
-                raise ValueError("match_score must be a number")
-            
-            if not all(isinstance(cost, (int, float)) for cost in city["estimated_cost"].values()):
-                raise ValueError("All cost values must be numbers")
-        
-        return v
+    model_config = ConfigDict(frozen=True)
 
-    
-class TripAgents:
-    def __init__(self, llm: ChatOpenAI, agent_name="Trip Agent"):
-        self.llm = llm
-        self.guardrails = GuardrailManager()
-        configure_tracing(agent_name)
+    recommended_cities: List[RecommendedCity] = Field(..., description="List of recommended cities with details")
 
-    def expert_travel_agent(self):
-        return Agent(
-            role="Expert Travel Agent",
-            backstory=dedent(f"""Expert in travel planning and logistics. 
-                             I have decades of experience making travel iteneraries"""),
-            goal=dedent(f"""
+    @classmethod
+    def from_trusted(cls, data: Dict[str, Any]):
+        """Build from agent output whose schema was already enforced, skipping validation.
+
+        Nested values are kept as the plain dicts and lists they were parsed into.
+        """
+        return cls.model_construct(**data)
+
+
+# Agent backstories and goals, dedented once at import
+_EXPERT_TRAVEL_BACKSTORY = dedent("""Expert in travel planning and logistics. 
+                             I have decades of experience making travel iteneraries""")
+_EXPERT_TRAVEL_GOAL = dedent("""
                         Create a detailed travel itinerary based on the specified duration,
                         include budget, packing suggestions, and safety tips.
                         The itinerary should be customized to the traveler's preferences
                         and constraints while staying within the specified budget.
-                        """),
-            tools=[
-                SearchInternetTool(),
-                WeatherForecastTool(),
-                LocalEventsTool(),
-                TravelBudgetTool() 
-            ],
-            
-            verbose=True,
-            llm=self.llm,
-            input_schema=TravelInput,
-            output_schema=TravelOutput,
-            input_validation=True,
-            output_validation=True
-        )
-
-    def city_selection_expert(self) -> Agent:
-        """Create an agent for city selection"""
-        return Agent(
-            role="City Selection Expert",
-            goal="Recommend the best cities based on user preferences and constraints",
-            backstory="""You are an expert travel advisor with extensive knowledge of cities worldwide.
+                        """)
+_TOUR_GUIDE_BACKSTORY = dedent("""I am an experienced local tour guide who knows all the hidden gems and must-see spots in the city.""")
+_TOUR_GUIDE_GOAL = dedent("""Create a detailed itinerary for a day tour in the city, including food recommendations, cultural experiences, and shopping spots.""")
+_TRANSPORTATION_BACKSTORY = dedent("""I am a transportation expert with extensive knowledge of various travel methods, routes, and transit systems worldwide. 
+                             I specialize in optimizing travel routes and finding the most efficient transportation options.""")
+_TRANSPORTATION_GOAL = dedent("""Plan optimal transportation routes, suggest the best travel methods, provide public transit information, 
+                        and estimate accurate travel times between locations for the traveler's itinerary.""")
+_ACCOMMODATION_BACKSTORY = dedent("""I am a seasoned accommodation specialist with years of experience in the hospitality industry. 
+                             I have deep knowledge of various lodging options, neighborhoods, and booking strategies worldwide.""")
+_ACCOMMODATION_GOAL = dedent("""Recommend the best hotels and rentals, suggest ideal neighborhoods to stay in, provide booking tips, 
+                        and analyze accommodation reviews to ensure the best stay for travelers.""")
+_FOOD_DINING_BACKSTORY = dedent("""I am a culinary expert and food tour specialist with extensive knowledge of global cuisines, 
+                             local specialties, and dietary requirements. I have experience in creating memorable food experiences.""")
+_FOOD_DINING_GOAL = dedent("""Recommend the best restaurants, suggest local specialties, provide dietary restriction information, 
+                        and create comprehensive food tour itineraries that showcase the destination's culinary scene.""")
+_CITY_SELECTION_BACKSTORY = """You are an expert travel advisor with extensive knowledge of cities worldwide.
             You specialize in matching travelers with destinations that best suit their preferences,
             budget, and travel style. Use the calculate_match_score tool to evaluate how well each city
             matches the user's preferences.
@@ -190,107 +346,109 @@ class TripAgents:
                   }
                 }
               ]
-            }""",
+            }"""
+
+
+def _cached_agent(factory):
+    """Build an agent once per TripAgents instance and reuse it on later calls"""
+    @functools.wraps(factory)
+    def wrapper(self):
+        agent = self._agents.get(factory.__name__)
+        if agent is None:
+            agent = self._agents[factory.__name__] = factory(self)
+        return agent
+    return wrapper
+
+
+@dataclass(frozen=True, slots=True)
+class TripAgents:
+    # Guardrails hold no per-crew state, so every instance shares one manager
+    _GUARDRAILS: ClassVar[GuardrailManager] = GuardrailManager()
+
+    llm: ChatOpenAI
+    guardrails: GuardrailManager = field(default=_GUARDRAILS, init=False, repr=False, compare=False)
+    # Memoized agents are filled in place, so the instance itself stays frozen
+    _agents: Dict[str, Agent] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    @_cached_agent
+    def expert_travel_agent(self):
+        return Agent(
+            role="Expert Travel Agent",
+            backstory=_EXPERT_TRAVEL_BACKSTORY,
+            goal=_EXPERT_TRAVEL_GOAL,
+            tools=list(_EXPERT_TRAVEL_TOOLS),
+            
             verbose=True,
             llm=self.llm,
-            tools=[
-                SearchInternetTool(),
-                TravelBudgetTool(),
-                SafetyInfoTool(),
-                MatchScoreTool()
-            ],
+            input_schema=TravelInput,
+            output_schema=TravelOutput,
+            input_validation=True,
+            output_validation=True
+        )
+
+    @_cached_agent
+    def city_selection_expert(self) -> Agent:
+        """Create an agent for city selection"""
+        return Agent(
+            role="City Selection Expert",
+            goal="Recommend the best cities based on user preferences and constraints",
+            backstory=_CITY_SELECTION_BACKSTORY,
+            verbose=True,
+            llm=self.llm,
+            tools=list(_CITY_SELECTION_TOOLS),
             input_schema=CityInput,
             output_schema=CityOutput,
             input_validation=True,
             output_validation=True,
-            output_format={
-                "type": "json",
-                "schema": {
-                    "recommended_cities": [
-                        {
-                            "name": "string",
-                            "country": "string",
-                            "description": "string",
-                            "match_score": "number",
-                            "highlights": ["string"],
-                            "estimated_cost": {
-                                "accommodation": "number",
-                                "food": "number",
-                                "activities": "number",
-                                "total_per_day": "number"
-                            }
-                        }
-                    ]
-                }
-            }
+            output_format=_CITY_SELECTION_OUTPUT_FORMAT
         )
 
+    @_cached_agent
     def local_tour_guide(self):
         return Agent(
             role="Local Tour Guide",
-            backstory=dedent(f"""I am an experienced local tour guide who knows all the hidden gems and must-see spots in the city."""),
-            goal=dedent(f"""Create a detailed itinerary for a day tour in the city, including food recommendations, cultural experiences, and shopping spots."""),
-            tools=[
-                SearchInternetTool(),
-                LocalEventsTool(),
-                RestaurantRecommendationsTool()
-            ],
+            backstory=_TOUR_GUIDE_BACKSTORY,
+            goal=_TOUR_GUIDE_GOAL,
+            tools=list(_TOUR_GUIDE_TOOLS),
             verbose=True,
             llm=self.llm,
         )
     
+    @_cached_agent
     def transportation_specialist(self):
         return Agent(
             role="Transportation Specialist",
-            backstory=dedent(f"""I am a transportation expert with extensive knowledge of various travel methods, routes, and transit systems worldwide. 
-                             I specialize in optimizing travel routes and finding the most efficient transportation options."""),
-            goal=dedent(f"""Plan optimal transportation routes, suggest the best travel methods, provide public transit information, 
-                        and estimate accurate travel times between locations for the traveler's itinerary."""),
-            tools=[
-                SearchInternetTool(),
-                CalculatorTool(),
-                TransportationRoutesTool(),
-                TravelBudgetTool(),
-            ],
+            backstory=_TRANSPORTATION_BACKSTORY,
+            goal=_TRANSPORTATION_GOAL,
+            tools=list(_TRANSPORTATION_TOOLS),
             verbose=True,
             llm=self.llm,
         )
 
+    @_cached_agent
     def accommodation_expert(self):
         return Agent(
             role="Accommodation Expert",
-            backstory=dedent(f"""I am a seasoned accommodation specialist with years of experience in the hospitality industry. 
-                             I have deep knowledge of various lodging options, neighborhoods, and booking strategies worldwide."""),
-            goal=dedent(f"""Recommend the best hotels and rentals, suggest ideal neighborhoods to stay in, provide booking tips, 
-                        and analyze accommodation reviews to ensure the best stay for travelers."""),
-            tools=[
-                SearchInternetTool(),
-                AccommodationOptionsTool(),
-                TravelBudgetTool(),
-                SafetyInfoTool()
-            ],
+            backstory=_ACCOMMODATION_BACKSTORY,
+            goal=_ACCOMMODATION_GOAL,
+            tools=list(_ACCOMMODATION_TOOLS),
             
             verbose=True,
             llm=self.llm,
         )
 
+    @_cached_agent
     def food_dining_guide(self):
         return Agent(
             role="Food & Dining Guide",
-            backstory=dedent(f"""I am a culinary expert and food tour specialist with extensive knowledge of global cuisines, 
-                             local specialties, and dietary requirements. I have experience in creating memorable food experiences."""),
-            goal=dedent(f"""Recommend the best restaurants, suggest local specialties, provide dietary restriction information, 
-                        and create comprehensive food tour itineraries that showcase the destination's culinary scene."""),
-            tools=[
-                SearchInternetTool(),
-                RestaurantRecommendationsTool(),
-                LocalEventsTool(),
-                TravelBudgetTool()
-            ],
+            backstory=_FOOD_DINING_BACKSTORY,
+            goal=_FOOD_DINING_GOAL,
+            tools=list(_FOOD_DINING_TOOLS),
             verbose=True,
             llm=self.llm,
         )
 
+    @_cached_agent
     def travel_planning_expert(self) -> Agent:
         """Create an agent for travel planning"""
         return Agent(
@@ -301,50 +459,11 @@ class TripAgents:
             and ensuring travelers have memorable experiences.""",
             verbose=True,
             llm=self.llm,
-            tools=[
-                SearchInternetTool(),
-                WeatherForecastTool(),
-                LocalEventsTool(),
-                TravelBudgetTool()
-            ],
-            output_format={
-                "type": "json",
-                "schema": {
-                    "itinerary": [
-                        {
-                            "day": "number",
-                            "date": "string",
-                            "activities": [
-                                {
-                                    "time": "string",
-                                    "activity": "string",
-                                    "description": "string",
-                                    "location": "string",
-                                    "duration": "string",
-                                    "cost": "number"
-                                }
-                            ],
-                            "meals": [
-                                {
-                                    "time": "string",
-                                    "type": "string",
-                                    "suggestion": "string",
-                                    "cost": "number"
-                                }
-                            ]
-                        }
-                    ],
-                    "budget_breakdown": {
-                        "accommodation": "number",
-                        "food": "number",
-                        "activities": "number",
-                        "transportation": "number",
-                        "total": "number"
-                    }
-                }
-            }
+            tools=list(_TRAVEL_PLANNING_TOOLS),
+            output_format=_TRAVEL_PLANNING_OUTPUT_FORMAT
         )
 
+    @_cached_agent
     def budget_planner(self) -> Agent:
         """Create an agent for budget planning"""
         return Agent(
@@ -355,28 +474,6 @@ class TripAgents:
             all possible expenses while ensuring the best value for money.""",
             verbose=True,
             llm=self.llm,
-            tools=[
-                SearchInternetTool(),
-                CalculatorTool(),
-            ],
-            output_format={
-                "type": "json",
-                "schema": {
-                    "budget_breakdown": {
-                        "accommodation": "number",
-                        "food": "number",
-                        "activities": "number",
-                        "transportation": "number",
-                        "total": "number"
-                    }
-                }
-            }
+            tools=list(_BUDGET_PLANNER_TOOLS),
+            output_format=_BUDGET_PLANNER_OUTPUT_FORMAT
         )
-
-def configure_tracing(agent_name: str):
-    
-    """Configure tracing for the agent"""
-    try:
-        setup_telemetry()
-    except Exception as e:
-        print(f"Failed to configure tracing: {str(e)}")
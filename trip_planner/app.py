@@ -1,51 +1,40 @@
 import streamlit as st
 import json
+import functools
+import orjson
+import hashlib
 from datetime import datetime, timedelta
-import pandas as pd
-import plotly.express as px
 import os
 import litellm
 from dotenv import load_dotenv
 load_dotenv()
-from trip_planner.telemetry import setup_telemetry
-from langchain_openai import ChatOpenAI
-from .agents import TripAgents, TravelInput, CityInput
+from .agents import TripAgents, TravelInput, CityInput, CityOutput, create_llm
 from .guardrails import GuardrailManager
-from .tools.travel_tools import WeatherForecastTool, LocalEventsTool,SafetyInfoTool
+from .llm_cache import MemoryCache
+from .tools.travel_tools import fetch_local_events, fetch_safety_info, fetch_weather
 from crewai import Task, Crew
 from opentelemetry import trace
 from opentelemetry.trace import Status, StatusCode
-import openai
-import re
+from typing import Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from opentelemetry.context import get_current
+from pydantic import ValidationError
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+# Debug output is only streamed to the browser when DEBUG is set
+DEBUG = bool(os.getenv("DEBUG"))
 
-st.success("Telemetry initialized successfully!")
 tracer = trace.get_tracer(__name__)
-with tracer.start_as_current_span("app_initialization") as span:
-    span.set_attribute("app.name", "AI Travel Planner")
-    span.set_attribute("app.version", "1.0.0")
-    span.set_status(Status(StatusCode.OK)) 
-        
-st.info("Test trace created successfully!")
-
-# Initialize telemetry (will only initialize once due to singleton pattern)
-#tracer_provider = setup_telemetry()
-#if tracer_provider is None:
-#    st.warning("""
-#    Telemetry is not available. The application will continue without tracing.
-#    To enable tracing, set the following environment variables:
-#    - PHOENIX_ENABLED=true
-#    - PHOENIX_CLIENT_HEADERS=api_key=your_phoenix_api_key
-#    """)
-#else:
-#    st.success("Telemetry initialized successfully!")
-    # Test trace
-#    tracer = trace.get_tracer(__name__)
-#    with tracer.start_as_current_span("app_initialization") as span:
-#        span.set_attribute("app.name", "AI Travel Planner")
-#        span.set_attribute("app.version", "1.0.0")
-#        span.set_status(Status(StatusCode.OK)) 
-#        st.info("Test trace created successfully!")
+# Streamlit reruns this module on every interaction; emit the boot span once per session
+if not st.session_state.get("_telemetry_boot"):
+    with tracer.start_as_current_span("app_initialization") as span:
+        span.set_attribute("app.name", "AI Travel Planner")
+        span.set_attribute("app.version", "1.0.0")
+        span.set_status(Status(StatusCode.OK))
+    st.session_state._telemetry_boot = True
+    if DEBUG:
+        st.success("Telemetry initialized successfully!")
+        st.info("Test trace created successfully!")
 
 # Custom CSS
 st.markdown("""
@@ -73,19 +62,75 @@ litellm.api_key = os.environ["OPENAI_API_KEY"]
 
     
     
-llm = ChatOpenAI(
-    model="gpt-4-turbo-preview",
-    temperature=0.7,
-    streaming=True,                           #enable streaming
-    model_kwargs={"stream_options": {"include_usage": True}}
-)
+@st.cache_resource
+def get_llm():
+    """LLM client shared by every session and rerun"""
+    return create_llm(
+        streaming=True,                           #enable streaming
+        model_kwargs={"stream_options": {"include_usage": True}}
+    )
+
+def get_agents() -> TripAgents:
+    """Agents for a single run; CrewAI mutates Agent state while running, so sessions never share them"""
+    return TripAgents(get_llm())
+
+@st.cache_resource
+def get_guardrails() -> GuardrailManager:
+    """Guardrails shared by every session and rerun"""
+    return GuardrailManager()
+
+@functools.lru_cache(maxsize=64)
+def _cached_validate_input(guardrails: GuardrailManager, key: tuple, today: str) -> Tuple[bool, Optional[str]]:
+    """Validate form input once per distinct input and guardrail manager"""
+    # today is only part of the cache key: the date checks depend on it, so a
+    # verdict must not outlive the day it was made on
+    del today
+    return guardrails.validate_input({k: list(v) if isinstance(v, tuple) else v for k, v in key})
 
+def validate_input(input_data: dict) -> Tuple[bool, Optional[str]]:
+    """Run the input guardrails, reusing the verdict for unchanged resubmits"""
+    key = tuple(sorted((k, tuple(v) if isinstance(v, list) else v) for k, v in input_data.items()))
+    return _cached_validate_input(get_guardrails(), key, datetime.now().date().isoformat())
+
+# These lookups raise when an API fails or its circuit is open, and st.cache_data
+# does not cache exceptions, so placeholder data is never cached or shown as real
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cached_weather(destination: str, date: str) -> dict:
+    """Weather forecast for a destination, cached across reruns and cards"""
+    return fetch_weather(destination, date)
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cached_events(destination: str, date_range_key: Optional[Tuple[str, str]] = None) -> list:
+    """Local events for a destination, keyed on a hashable (start, end) tuple"""
+    date_range = {"start": date_range_key[0], "end": date_range_key[1]} if date_range_key else None
+    return fetch_local_events(destination, date_range)
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cached_safety(destination: str) -> dict:
+    """Safety information for a destination, cached across reruns"""
+    return fetch_safety_info(destination)
+
+def _prefetch_pool(max_workers: int) -> ThreadPoolExecutor:
+    """Thread pool whose workers share the session's ScriptRunContext, so st.cache_data works in them"""
+    return ThreadPoolExecutor(
+        max_workers=max_workers,
+        initializer=add_script_run_ctx,
+        initargs=(None, get_script_run_ctx())
+    )
 
-# Initialize agents
-agents = TripAgents(llm)
+def _result_or_none(future, what: str):
+    """Result of a prefetch future, or None if its lookup failed"""
+    try:
+        return future.result()
+    except Exception as e:
+        print(f"Error prefetching {what}: {str(e)}")
+        return None
 
-# Initialize guardrails
-guardrails = GuardrailManager()
+def _date_range_key(date_range: Optional[dict]) -> Optional[Tuple[str, str]]:
+    """Turn a date range dict into a hashable cache key"""
+    if not date_range:
+        return None
+    return (date_range.get("start"), date_range.get("end"))
 
 def initialize_session_state():
     """Initialize session state variables"""
@@ -113,8 +158,7 @@ def display_weather_forecast(destination: str, date: str):
         span.set_attribute("date", date)
         try:
             with st.spinner("Getting weather forecast..."):
-                weather_tool = WeatherForecastTool()
-                weather = json.loads(weather_tool._run(destination, date))
+                weather = _cached_weather(destination, date)
                 col1, col2, col3, col4 = st.columns([1, 2, 1, 1])
                 col1.metric("Temperature", f"{weather['temperature']}°C")
                 col2.markdown(f"<span style='font-size:1.5em'>{weather['condition']}</span>", unsafe_allow_html=True)
@@ -126,14 +170,21 @@ def display_weather_forecast(destination: str, date: str):
             span.set_status(Status(StatusCode.ERROR, str(e)))
             st.error(f"Error getting weather: {e}")
 
+def _weather_html(weather: dict) -> str:
+    """Render a weather forecast as a single small HTML table"""
+    return (
+        "<table><tr><th>Temperature</th><th>Condition</th><th>Humidity</th><th>Wind Speed</th></tr>"
+        f"<tr><td>{weather['temperature']}°C</td><td>{weather['condition']}</td>"
+        f"<td>{weather['humidity']}%</td><td>{weather['wind_speed']} km/h</td></tr></table>"
+    )
+
 def display_safety_info(destination: str):
     """Display safety information for a destination"""
     with tracer.start_as_current_span("safety_info_task", get_current()) as span:
         span.set_attribute("destination", destination)
         try:
             with st.spinner("Getting safety information..."):
-                safety_tool = SafetyInfoTool()
-                safety_info = json.loads(safety_tool._run(destination))
+                safety_info = _cached_safety(destination)
                 st.subheader("Safety Information")
                 st.info(f"General Safety: {safety_info['general_safety']}")
                 st.info(f"Health Concerns: {safety_info['health_concerns']}")
@@ -153,8 +204,7 @@ def display_local_events(destination: str, date_range: dict = None):
             span.set_attribute("date_range", str(date_range))
         try:
             with st.spinner("Getting local events..."):
-                events_tool = LocalEventsTool()
-                events = json.loads(events_tool._run(destination, date_range))
+                events = _cached_events(destination, _date_range_key(date_range))
                 st.subheader("Local Events")
                 for event in events:
                     with st.expander(f"🎉 {event.get('name', 'Event')} - {event.get('date', '')}"):
@@ -167,15 +217,12 @@ def display_local_events(destination: str, date_range: dict = None):
 
 def display_budget_analysis(budget_breakdown: dict):
     """Display budget analysis with visualizations"""
+    import pandas as pd
     st.subheader("Budget Analysis")
     
-    # Create pie chart for budget distribution
-    fig = px.pie(
-        values=list(budget_breakdown.values()),
-        names=list(budget_breakdown.keys()),
-        title="Budget Distribution"
-    )
-    st.plotly_chart(fig)
+    # Chart the individual categories; the total is shown as a metric below
+    costs = {k: v for k, v in budget_breakdown.items() if k != 'total'}
+    st.bar_chart(pd.DataFrame({"Cost": list(costs.values())}, index=list(costs.keys())))
     
     # Display budget metrics
     col1, col2, col3, col4, col5 = st.columns(5)
@@ -187,75 +234,139 @@ def display_budget_analysis(budget_breakdown: dict):
 
 def display_city_comparison(cities: list):
     """Display comparison of recommended cities only if 3 or more cities are present."""
+    import pandas as pd
     if len(cities) < 3:
         return  # Skip plots for 1-2 cities
     st.subheader("City Comparison")
-    metrics = {
-        "Match Score": [city["match_score"] for city in cities],
-        "Daily Cost": [city["estimated_cost"]["total_per_day"] for city in cities],
-        "City": [city["name"] for city in cities]
-    }
-    fig = px.bar(
-        x="City",
-        y="Match Score",
-        data_frame=pd.DataFrame(metrics),
-        title="City Match Scores"
-    )
-    st.plotly_chart(fig)
-    fig = px.bar(
-        x="City",
-        y="Daily Cost",
-        data_frame=pd.DataFrame(metrics),
-        title="Daily Costs Comparison"
+    df = pd.DataFrame.from_records(
+        [(city["name"], city["match_score"], city["estimated_cost"]["total_per_day"]) for city in cities],
+        columns=["City", "Match Score", "Daily Cost"],
+        index="City"
     )
-    st.plotly_chart(fig)
+    st.markdown("**City Match Scores**")
+    st.bar_chart(df[["Match Score"]])
+    st.markdown("**Daily Costs Comparison**")
+    st.bar_chart(df[["Daily Cost"]])
+
+def _prefetch_city_aux(cities: list, date: str) -> dict:
+    """Fetch weather, events and safety for every city concurrently.
+
+    Results land in the st.cache_data caches, so the cards and expanders below
+    render from memory instead of making the tool calls one after another.
+    """
+    if not cities:
+        return {}
+    names = [city['name'] for city in cities]
+    with _prefetch_pool(min(16, 3 * len(names))) as pool:
+        weather = {name: pool.submit(_cached_weather, name, date) for name in names}
+        events = {name: pool.submit(_cached_events, name) for name in names}
+        for name in names:
+            pool.submit(_cached_safety, name)
+        return {
+            name: {
+                "weather": _result_or_none(weather[name], "weather"),
+                "events": _result_or_none(events[name], "events") or []
+            }
+            for name in names
+        }
+
+def _prefetch_weather(destination: str, dates: list) -> None:
+    """Warm the weather cache for every day of a trip concurrently"""
+    dates = list(dict.fromkeys(dates))
+    if not dates:
+        return
+    with _prefetch_pool(min(8, len(dates))) as pool:
+        for date in dates:
+            pool.submit(_cached_weather, destination, date)
+
+def _trip_dates(start_date, end_date) -> list:
+    """ISO dates of every day of a trip, start and end inclusive"""
+    return [(start_date + timedelta(days=i)).isoformat()
+            for i in range((end_date - start_date).days + 1)]
+
+def _prefetch_trip_context(destination: str, dates: list) -> dict:
+    """Gather current weather, safety and events for a trip concurrently.
+
+    The result is handed to the planner up front so it does not have to spend
+    tool-call rounds looking the same things up one at a time. Lookups that
+    fail are left out, so placeholder data is never presented as fact. The
+    weather API only reports current conditions, so it is fetched once.
+    """
+    with _prefetch_pool(3) as pool:
+        futures = {
+            "current_weather": pool.submit(_cached_weather, destination, dates[0]),
+            "safety": pool.submit(_cached_safety, destination),
+            "events": pool.submit(_cached_events, destination, (dates[0], dates[-1]))
+        }
+
+    context = {}
+    for name, future in futures.items():
+        result = _result_or_none(future, name)
+        if result is not None:
+            context[name] = result
+    return context
 
 def display_city_recommendations(cities):
     """Display city recommendations as summary cards for all cities."""
     st.subheader("Recommended Cities")
+    aux = _prefetch_city_aux(cities, datetime.now().strftime("%Y-%m-%d"))
     display_city_comparison(cities)
-    # Show all cities as cards in a grid
+    # Show each city as a card with its details expander, in a single pass
     cols = st.columns(min(3, len(cities)))
     for idx, city in enumerate(cities):
+        info = aux[city['name']]
+        weather, events = info["weather"], info["events"]
         with cols[idx % len(cols)]:
-            st.markdown(f"### 🌆 {city['name']}, {city['country']} (Score: {city['match_score']:.2f})")
-            st.markdown(f"**Description:** {city['description']}")
-            st.markdown(f"**Estimated Daily Cost:** ${city['estimated_cost']['total_per_day']}")
-            st.markdown(f"**Highlights:** {' | '.join(city['highlights'])}")
-            # Weather summary
-            weather_tool = WeatherForecastTool()
-            weather = json.loads(weather_tool._run(city['name'], datetime.now().strftime("%Y-%m-%d")))
-            st.markdown(f"**Weather:** {weather['temperature']}°C, {weather['condition']}")
-            # Events summary
-            events_tool = LocalEventsTool()
-            events = json.loads(events_tool._run(city['name'], None))
+            # Card summary: description, cost, highlights, weather, first event and safety link
+            card = [
+                f"### 🌆 {city['name']}, {city['country']} (Score: {city['match_score']:.2f})",
+                f"**Description:** {city['description']}",
+                f"**Estimated Daily Cost:** ${city['estimated_cost']['total_per_day']}",
+                f"**Highlights:** {' | '.join(city['highlights'])}",
+                f"**Weather:** {weather['temperature']}°C, {weather['condition']}" if weather else "**Weather:** unavailable",
+            ]
             if events:
-                st.markdown(f"**Events:** {events[0].get('name', 'Event')} ({events[0].get('date', '')[:10]})")
-            # Safety summary
-            st.markdown("[Travel Advisory](https://www.travel-advisory.info/) for safety info.")
+                card.append(f"**Events:** {events[0].get('name', 'Event')} ({events[0].get('date', '')[:10]})")
+            card.append("[Travel Advisory](https://www.travel-advisory.info/) for safety info.")
+            st.markdown("\n\n".join(card))
+            with st.expander(f"More about {city['name']}"):
+                st.markdown(
+                    "**Highlights:**\n\n"
+                    + "\n".join(f"- :star: {highlight}" for highlight in city['highlights'])
+                    + "\n\n**Weather Forecast:**\n\n" + (_weather_html(weather) if weather else "Unavailable"),
+                    unsafe_allow_html=True
+                )
+                display_safety_info(city['name'])
+                st.markdown(
+                    "**Events:**\n\n"
+                    + "\n".join(f"- {event.get('name', 'Event')} ({event.get('date', '')[:10]})" for event in events)
+                    + "\n\n**Estimated Daily Costs:**"
+                )
+                costs = city['estimated_cost']
+                st.metric("Accommodation", f"${costs['accommodation']}")
+                st.metric("Food", f"${costs['food']}")
+                st.metric("Activities", f"${costs['activities']}")
+                st.metric("Total per day", f"${costs['total_per_day']}", 
+                         delta=f"${costs['total_per_day'] - 200:.2f} vs budget")
             st.markdown("---")
-    # Optionally, expand for details
-    for city in cities:
-        with st.expander(f"More about {city['name']}"):
-            st.markdown(f"**Description:** {city['description']}")
-            st.markdown("**Highlights:**")
-            for highlight in city['highlights']:
-                st.markdown(f"- :star: {highlight}")
-            st.markdown("**Weather Forecast:**")
-            display_weather_forecast(city['name'], datetime.now().strftime("%Y-%m-%d"))
-            display_safety_info(city['name'])
-            st.markdown("**Events:**")
-            events_tool = LocalEventsTool()
-            for event in json.loads(events_tool._run(city['name'], None)):
-                st.markdown(f"- {event.get('name', 'Event')} ({event.get('date', '')[:10]})")
-            st.markdown("**Estimated Daily Costs:**")
-            costs = city['estimated_cost']
-            st.metric("Accommodation", f"${costs['accommodation']}")
-            st.metric("Food", f"${costs['food']}")
-            st.metric("Activities", f"${costs['activities']}")
-            st.metric("Total per day", f"${costs['total_per_day']}", 
-                     delta=f"${costs['total_per_day'] - 200:.2f} vs budget")
-            st.markdown("<br>", unsafe_allow_html=True)
+
+def _plan_key(plan: dict) -> str:
+    """Stable hash of a travel plan, used to key the export caches"""
+    return hashlib.sha1(orjson.dumps(plan, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+@st.cache_data(show_spinner=False)
+def _plan_json(plan_key: str, _plan: dict) -> bytes:
+    """Serialize the plan for download; _plan is excluded from Streamlit's hashing"""
+    return orjson.dumps(_plan, option=orjson.OPT_INDENT_2)
+
+@st.cache_data(show_spinner=False)
+def _plan_csv(plan_key: str, _plan: dict) -> bytes:
+    """Flatten the itinerary activities into CSV for download"""
+    import pandas as pd
+    df = pd.json_normalize(_plan['itinerary'], record_path='activities', meta=['day', 'date'])
+    df = df.reindex(columns=['day', 'date', 'time', 'activity', 'location', 'duration', 'cost'])
+    df.columns = ['Day', 'Date', 'Time', 'Activity', 'Location', 'Duration', 'Cost']
+    return df.to_csv(index=False).encode()
 
 def display_travel_plan(plan):
     """Display travel plan in a visually appealing way"""
@@ -266,72 +377,114 @@ def display_travel_plan(plan):
     
     # Display itinerary
     st.markdown("### 📅 Daily Itinerary")
+    _prefetch_weather(plan['destination'], [day['date'] for day in plan['itinerary']])
     for day in plan['itinerary']:
         with st.expander(f"Day {day['day']} - {day['date']}"):
             # Display weather forecast for the day
             display_weather_forecast(plan['destination'], day['date'])
             
-            # Display activities
-            st.markdown("#### 🎯 Activities")
-            for activity in day['activities']:
-                col1, col2 = st.columns([3, 1])
-                with col1:
-                    st.markdown(f"**{activity['time']} - {activity['activity']}**")
-                    st.markdown(f"📍 {activity['location']}")
-                    st.markdown(f"⏱️ {activity['duration']}")
-                with col2:
-                    st.metric("Cost", f"${activity['cost']}")
-                st.markdown(f"_{activity['description']}_")
-                st.divider()
-            
-            # Display meals
-            st.markdown("#### 🍽️ Meals")
-            for meal in day['meals']:
-                col1, col2 = st.columns([3, 1])
-                with col1:
-                    st.markdown(f"**{meal['time']} - {meal['type']}**")
-                    st.markdown(f"🍴 {meal['suggestion']}")
-                with col2:
-                    st.metric("Cost", f"${meal['cost']}")
+            # Display activities and meals, one markdown block per section (escaped $ keeps costs out of LaTeX)
+            st.markdown("#### 🎯 Activities\n\n" + "\n\n---\n\n".join(
+                f"**{activity['time']} - {activity['activity']}** · 💵 \\${activity['cost']}\n\n"
+                f"📍 {activity['location']}  \n⏱️ {activity['duration']}\n\n"
+                f"_{activity['description']}_"
+                for activity in day['activities']
+            ))
+            st.markdown("#### 🍽️ Meals\n\n" + "\n\n".join(
+                f"**{meal['time']} - {meal['type']}** · 💵 \\${meal['cost']}  \n🍴 {meal['suggestion']}"
+                for meal in day['meals']
+            ))
     
     # Display recommendations
-    st.markdown("### 💡 Recommendations")
-    for i, rec in enumerate(plan['recommendations'], 1):
-        st.markdown(f"{i}. {rec}")
+    st.markdown("### 💡 Recommendations\n\n" + "\n".join(
+        f"{i}. {rec}" for i, rec in enumerate(plan['recommendations'], 1)
+    ))
     
     # Add export options
     st.markdown("### 📤 Export Options")
+    # Payloads are cached per plan; on_click="ignore" keeps a download from rerunning the script
+    plan_key = _plan_key(plan)
     col1, col2 = st.columns(2)
     with col1:
-        if st.button("Export as JSON"):
-            st.download_button(
-                label="Download JSON",
-                data=json.dumps(plan, indent=2),
-                file_name="travel_plan.json",
-                mime="application/json"
-            )
+        st.download_button(
+            label="Download JSON",
+            data=_plan_json(plan_key, plan),
+            file_name="travel_plan.json",
+            mime="application/json",
+            on_click="ignore"
+        )
     with col2:
-        if st.button("Export as CSV"):
-            # Convert itinerary to CSV format
-            itinerary_data = []
-            for day in plan['itinerary']:
-                for activity in day['activities']:
-                    itinerary_data.append({
-                        'Day': day['day'],
-                        'Date': day['date'],
-                        'Time': activity['time'],
-                        'Activity': activity['activity'],
-                        'Location': activity['location'],
-                        'Duration': activity['duration'],
-                        'Cost': activity['cost']
-                    })
-            df = pd.DataFrame(itinerary_data)
-            st.download_button(
-                label="Download CSV",
-                data=df.to_csv(index=False),
-                file_name="travel_plan.csv",
-                mime="text/csv"
-            )
+        st.download_button(
+            label="Download CSV",
+            data=_plan_csv(plan_key, plan),
+            file_name="travel_plan.csv",
+            mime="text/csv",
+            on_click="ignore"
+        )
+
+# Task descriptions keep the static instructions first and the per-request inputs last
+_CITY_TASK_TEMPLATE = """Recommend cities for travel. Return at least 5 cities in the response.
+Preferences: {preferences}"""
+
+_TRAVEL_TASK_TEMPLATE = """Create a detailed travel plan.
+Your response MUST be a valid JSON object with the following structure:
+{{
+    "destination": "City name",
+    "itinerary": [
+        {{
+            "day": 1,
+            "date": "YYYY-MM-DD",
+            "activities": [
+                {{
+                    "time": "09:00",
+                    "activity": "Activity name",
+                    "description": "Activity description",
+                    "location": "Location name",
+                    "duration": "2 hours",
+                    "cost": 50
+                }}
+            ],
+            "meals": [
+                {{
+                    "time": "12:00",
+                    "type": "Lunch",
+                    "suggestion": "Restaurant name",
+                    "cost": 30
+                }}
+            ]
+        }}
+    ],
+    "budget_breakdown": {{
+        "accommodation": 500,
+        "food": 300,
+        "activities": 400,
+        "transportation": 200,
+        "total": 1400
+    }},
+    "recommendations": [
+        "Recommendation 1",
+        "Recommendation 2"
+    ]
+}}
+Preferences: {preferences}
+Known conditions for the trip: {conditions}"""
+
+# City recommendations stay fresh for six hours
+CITY_RECOMMENDATION_TTL = 6 * 60 * 60
+
+@st.cache_resource
+def _city_recommendation_cache() -> MemoryCache:
+    """Process-wide exact-match cache of city recommendations, shared across sessions"""
+    return MemoryCache(max_size_mb=32)
+
+def _show_city_recommendations(result_data: dict):
+    """Store city recommendations in the session and render them"""
+    st.session_state.selected_cities = result_data
+    st.session_state.current_step = 'travel_planning'
+    display_city_recommendations(result_data['recommended_cities'])
+    # Show success message and set flag for proceed button
+    st.success("✅ City recommendations generated successfully!")
+    st.session_state.show_proceed_button = True
 
 def city_selection_form():
     """Display the city selection form and handle city recommendations"""
@@ -377,7 +530,7 @@ def city_selection_form():
                 "season": season
             }
             
-            is_valid, error_message = guardrails.validate_input(input_data)
+            is_valid, error_message = validate_input(input_data)
             if not is_valid:
                 st.error(error_message)
                 return
@@ -390,192 +543,157 @@ def city_selection_form():
                 season=season
             )
             
+            # Reuse recommendations only for exactly the same form inputs
+            cache_key = "city_recommendations|" + json.dumps(
+                {**input_data, "preferences": sorted(preferences)}, sort_keys=True
+            )
+            cached = _city_recommendation_cache().get(cache_key)
+            if cached is not None:
+                _show_city_recommendations(cached)
+                return
+            
             # Get city recommendations
-            with st.spinner("Getting city recommendations..."):
-                city_expert = agents.city_selection_expert()
-                task = Task(
-                    description=f"""Based on these preferences: {city_input.dict()}, recommend cities for travel.
-                    Return at least 5 cities in the response.
-                    Your response MUST be a valid JSON object with the following structure:
-                    {{
-                        "recommended_cities": [
-                            {{
-                                "name": "City Name",
-                                "country": "Country Name",
-                                "description": "Brief description of the city",
-                                "match_score": 0.95,
-                                "highlights": ["Highlight 1", "Highlight 2"],
-                                "estimated_cost": 
-                                {{
-                                    "accommodation": 100,
-                                    "food": 50,
-                                    "activities": 75,
-                                    "total_per_day": 225
-                                }}
-                            }}
-                        ]
-                    }}""",
-                    expected_output="JSON with a list of at least 5 recommended cities and their details.",
-                    agent=city_expert
-                )
+            status = st.status("Getting city recommendations...", expanded=False)
+            city_expert = get_agents().city_selection_expert()
+            task = Task(
+                description=_CITY_TASK_TEMPLATE.format(preferences=city_input.model_dump_json()),
+                expected_output="JSON with a list of at least 5 recommended cities and their details.",
+                agent=city_expert,
+                # CrewAI derives the output format from CityOutput and converts the answer to it
+                output_pydantic=CityOutput
+            )
 
-                crew = Crew(
-                    agents=[city_expert],
-                    tasks=[task]
-                )
-                with tracer.start_as_current_span("city_recommendation_task") as span:  # ✅ Tracing starts here
-                    span.set_attribute("season", season)
-                    span.set_attribute("budget", budget)
-                    span.set_attribute("preferences", str(preferences))
-                    
-                    result = None 
-                    
-                    try:
-                        result = crew.kickoff()
-                        # --- Token usage tracing for Phoenix ---
-                        usage = None
-                        if isinstance(result, dict) and "token_usage" in result:
-                            u = result["token_usage"]                 # UsageMetrics object
-                            usage = {
-                                "prompt_tokens":     u.prompt_tokens,
-                                "completion_tokens": u.completion_tokens,
-                                "total_tokens":      u.total_tokens,
-                            }
-                        elif hasattr(result, "token_usage"):          # CrewOutput object
-                            u = result.token_usage
-                            usage = {
-                                "prompt_tokens":     u.prompt_tokens,
-                                "completion_tokens": u.completion_tokens,
-                                "total_tokens":      u.total_tokens,
-                            }
-                        if usage:
-                            try:
-                                span.set_attribute("token.usage.prompt",     int(usage.get("prompt_tokens", 0)))
-                                span.set_attribute("token.usage.completion", int(usage.get("completion_tokens", 0)))
-                                span.set_attribute("token.usage.total",      int(usage.get("total_tokens", 0)))
-                                print("Set Phoenix token attributes:", usage)
-                            except Exception as e:
-                                print("Error setting Phoenix token attributes:", e, usage)
-                        # --- End token usage tracing ---
-                        span.set_status(Status(StatusCode.OK))
-                    except Exception as e:
-                        span.set_status(Status(StatusCode.ERROR, str(e)))
-                        st.error(f"Agent execution error: {e}")
-                        import traceback
-                        traceback.print_exc()
-                        return
-                # Debug logging
-                #if result:
-                #    st.write("Raw result:", result)
-                #else:
-                #    st.warning("No result received from the agent.")
+            crew = Crew(
+                agents=[city_expert],
+                tasks=[task]
+            )
+            with tracer.start_as_current_span("city_recommendation_task") as span:  # ✅ Tracing starts here
+                span.set_attribute("season", season)
+                span.set_attribute("budget", budget)
+                span.set_attribute("preferences", str(preferences))
+                
+                result = None 
                 
-                # Validate output using guardrails
-                #try:
-                    # Try to parse the result as JSON
-                    #if isinstance(result, str):
-                    #    result_data = json.loads(result)
-                    #else:
-                    #    result_data = result
-                    #if isinstance(result, dict) and "raw" in result:
-                    #    try:
-                    #        result_data = json.loads(result["raw"])
-                    #    except Exception as e:
-                    #        st.error("Could not parse the 'raw' field as JSON.")
-                    #        st.write("Raw value:", result["raw"])
-                    #        return
-                    #else:
-                    #    result_data = result
-                    #st.write("Parsed result data:", result_data)
-                    # Parse the result - FIX THE MAIN ISSUE HERE
                 try:
-                    # The result from CrewAI is typically a CrewOutput object
-                    # Extract the raw text from the result
-                    if hasattr(result, 'raw'):
-                        raw_text = result.raw
-                    elif isinstance(result, str):
-                        raw_text = result
-                    else:
-                        raw_text = str(result)
-                    
-                    st.write("DEBUG - Raw result:", raw_text)
-                    
-                    # Parse the JSON from the raw text
-                    result_data = json.loads(raw_text)
-                    st.write("DEBUG - Parsed result data:", result_data)
-                    
-                    
-                    # Validate the structure
-                    if not isinstance(result_data, dict):
-                        st.error("Invalid response format: expected a dictionary")
-                        return
-                    
-                    if 'recommended_cities' not in result_data:
-                        st.error("Invalid response format: missing 'recommended_cities' key")
-                        return
-                    
-                    if not isinstance(result_data['recommended_cities'], list):
-                        st.error("Invalid response format: 'recommended_cities' should be a list")
-                        return
-                    
-                    # Validate each city's structure
-                    for i, city in enumerate(result_data['recommended_cities']):
-                        required_fields = {
-                            "name", "country", "description", "match_score",
-                            "highlights", "estimated_cost"
+                    status.update(label="Asking the city selection expert...")
+                    result = crew.kickoff()
+                    # --- Token usage tracing for Phoenix ---
+                    usage = None
+                    if isinstance(result, dict) and "token_usage" in result:
+                        u = result["token_usage"]                 # UsageMetrics object
+                        usage = {
+                            "prompt_tokens":     u.prompt_tokens,
+                            "completion_tokens": u.completion_tokens,
+                            "total_tokens":      u.total_tokens,
                         }
-                        missing_fields = required_fields - set(city.keys())
-                        if missing_fields:
-                            st.error(f"City {i+1} is missing required fields: {missing_fields}")
-                            return
-                        
-                        if not isinstance(city['estimated_cost'], dict):
-                            st.error(f"City {i+1}: 'estimated_cost' should be a dictionary")
-                            return
-                        
-                        cost_fields = {
-                            "accommodation", "food", "activities", "total_per_day"
+                    elif hasattr(result, "token_usage"):          # CrewOutput object
+                        u = result.token_usage
+                        usage = {
+                            "prompt_tokens":     u.prompt_tokens,
+                            "completion_tokens": u.completion_tokens,
+                            "total_tokens":      u.total_tokens,
                         }
-                        missing_costs = cost_fields - set(city['estimated_cost'].keys())
-                        if missing_costs:
-                            st.error(f"City {i+1}: 'estimated_cost' is missing fields: {missing_costs}")
-                            return
-                    
-                    # Store in session state
-                    st.session_state.selected_cities = result_data
-                    st.session_state.current_step = 'travel_planning'
-                    display_city_recommendations(result_data['recommended_cities'])
-                    # Show success message and set flag for proceed button
-                    st.success("✅ City recommendations generated successfully!")
-                    st.session_state.show_proceed_button = True
+                    if usage:
+                        try:
+                            span.set_attribute("token.usage.prompt",     int(usage.get("prompt_tokens", 0)))
+                            span.set_attribute("token.usage.completion", int(usage.get("completion_tokens", 0)))
+                            span.set_attribute("token.usage.total",      int(usage.get("total_tokens", 0)))
+                            print("Set Phoenix token attributes:", usage)
+                        except Exception as e:
+                            print("Error setting Phoenix token attributes:", e, usage)
+                    # --- End token usage tracing ---
+                    span.set_status(Status(StatusCode.OK))
+                except Exception as e:
+                    span.set_status(Status(StatusCode.ERROR, str(e)))
+                    status.update(label="Agent execution failed", state="error")
+                    st.error(f"Agent execution error: {e}")
+                    import traceback
+                    traceback.print_exc()
                     return
+            # Debug logging
+            #if result:
+            #    st.write("Raw result:", result)
+            #else:
+            #    st.warning("No result received from the agent.")
+            
+            # Validate output using guardrails
+            #try:
+                # Try to parse the result as JSON
+                #if isinstance(result, str):
+                #    result_data = json.loads(result)
+                #else:
+                #    result_data = result
+                #if isinstance(result, dict) and "raw" in result:
+                #    try:
+                #        result_data = json.loads(result["raw"])
+                #    except Exception as e:
+                #        st.error("Could not parse the 'raw' field as JSON.")
+                #        st.write("Raw value:", result["raw"])
+                #        return
+                #else:
+                #    result_data = result
+                #st.write("Parsed result data:", result_data)
+                # Parse the result - FIX THE MAIN ISSUE HERE
+            try:
+                # The result from CrewAI is typically a CrewOutput object
+                # Extract the raw text from the result
+                if hasattr(result, 'raw'):
+                    raw_text = result.raw
+                elif isinstance(result, str):
+                    raw_text = result
+                else:
+                    raw_text = str(result)
+                
+                if DEBUG:
+                    st.write("DEBUG - Raw result:", raw_text)
+                
+                # Use CrewAI's structured output, else parse and validate the JSON in one pass
+                status.update(label="Validating recommendations...")
+                city_output = getattr(result, 'pydantic', None)
+                if not isinstance(city_output, CityOutput):
+                    city_output = CityOutput.from_json(raw_text)
+                result_data = city_output.model_dump()
+                if DEBUG:
+                    st.write("DEBUG - Parsed result data:", result_data)
                 
-                except json.JSONDecodeError as e:
-                    st.error("Invalid JSON response from the AI. Please try again.")
+                _city_recommendation_cache().set(cache_key, result_data, ttl=CITY_RECOMMENDATION_TTL)
+                status.update(label="City recommendations ready", state="complete")
+                _show_city_recommendations(result_data)
+                return
+            
+            except ValidationError as e:
+                status.update(label="Could not validate recommendations", state="error")
+                if not any(error["type"] == "json_invalid" for error in e.errors()):
+                    st.error(f"Invalid response format: {e}")
+                    return
+                st.error("Invalid JSON response from the AI. Please try again.")
+                if DEBUG:
                     st.write("Raw result that failed to parse:", result)
-                    # Provide a fallback response
-                    fallback_response = {
-                        "recommended_cities": [
-                            {
-                                "name": "Barcelona",
-                                "country": "Spain",
-                                "description": "A vibrant city known for its beaches and rich cultural heritage.",
-                                "match_score": 0.9,
-                                "highlights": ["Sagrada Familia", "Beach", "Local Cuisine"],
-                                "estimated_cost": {
-                                    "accommodation": 80,
-                                    "food": 40,
-                                    "activities": 30,
-                                    "total_per_day": 150
-                                }
+                # Provide a fallback response
+                fallback_response = {
+                    "recommended_cities": [
+                        {
+                            "name": "Barcelona",
+                            "country": "Spain",
+                            "description": "A vibrant city known for its beaches and rich cultural heritage.",
+                            "match_score": 0.9,
+                            "highlights": ["Sagrada Familia", "Beach", "Local Cuisine"],
+                            "estimated_cost": {
+                                "accommodation": 80,
+                                "food": 40,
+                                "activities": 30,
+                                "total_per_day": 150
                             }
-                        ]
-                    }
-                    st.session_state.selected_cities = fallback_response
-                    #display_city_recommendations(fallback_response['recommended_cities'])
-                    st.session_state.trigger_next_step = True
-                except Exception as e:
-                    st.error(f"Unexpected error: {str(e)}")
+                        }
+                    ]
+                }
+                st.session_state.selected_cities = fallback_response
+                #display_city_recommendations(fallback_response['recommended_cities'])
+                st.session_state.trigger_next_step = True
+            except Exception as e:
+                status.update(label="Could not get city recommendations", state="error")
+                st.error(f"Unexpected error: {str(e)}")
+                if DEBUG:
                     st.write("Debug - Full error:", e)
 
     # OUTSIDE the form, show the proceed button if flag is set
@@ -624,14 +742,17 @@ def travel_planning_form():
         submitted = st.form_submit_button("Generate Travel Plan")
         
         if submitted:
+            trip_dates = _trip_dates(start_date, end_date)
+            start_str, end_str = trip_dates[0], trip_dates[-1]
+            
             # Validate input using guardrails
             input_data = {
-                "start_date": start_date.strftime("%Y-%m-%d"),
-                "end_date": end_date.strftime("%Y-%m-%d"),
+                "start_date": start_str,
+                "end_date": end_str,
                 "activities": activities
             }
             
-            is_valid, error_message = guardrails.validate_input(input_data)
+            is_valid, error_message = validate_input(input_data)
             if not is_valid:
                 st.error(error_message)
                 return
@@ -639,131 +760,112 @@ def travel_planning_form():
             # Create input for travel planning
             travel_input = TravelInput(
                 destination=selected_city,
-                start_date=start_date.strftime("%Y-%m-%d"),
-                end_date=end_date.strftime("%Y-%m-%d"),
+                start_date=start_str,
+                end_date=end_str,
                 activities=activities,
                 accommodation=accommodation
             )
             
+            preferences_json = travel_input.model_dump_json()
+            
             # Generate travel plan
-            with st.spinner("Generating your travel plan..."):
-                travel_expert = agents.travel_planning_expert()
-                task = Task(
-                    description=f"""Create a detailed travel plan based on these preferences: {travel_input.dict()}
-                    Your response MUST be a valid JSON object with the following structure:
-                    {{
-                        "itinerary": [
-                            {{
-                                "day": 1,
-                                "date": "YYYY-MM-DD",
-                                "activities": [
-                                    {{
-                                        "time": "09:00",
-                                        "activity": "Activity name",
-                                        "description": "Activity description",
-                                        "location": "Location name",
-                                        "duration": "2 hours",
-                                        "cost": 50
-                                    }}
-                                ],
-                                "meals": [
-                                    {{
-                                        "time": "12:00",
-                                        "type": "Lunch",
-                                        "suggestion": "Restaurant name",
-                                        "cost": 30
-                                    }}
-                                ]
-                            }}
-                        ],
-                        "budget_breakdown": {{
-                            "accommodation": 500,
-                            "food": 300,
-                            "activities": 400,
-                            "transportation": 200,
-                            "total": 1400
-                        }},
-                        "recommendations": [
-                            "Recommendation 1",
-                            "Recommendation 2"
-                        ]
-                    }}""",
-                    agent=travel_expert
-                )
-                travel_expert = agents.travel_planning_expert()
-                task = Task(description=f"Plan travel for: {travel_input.dict()}", agent=travel_expert)
-                crew = Crew(
-                    agents=[travel_expert],
-                    tasks=[task]
-                )
-                with tracer.start_as_current_span("travel_plan_generation_task") as span:  # ✅ Tracing block added
-                    span.set_attribute("destination", travel_input.destination)
-                    span.set_attribute("duration_days", (end_date - start_date).days)
-                    span.set_attribute("activities", str(activities))
-                    try:
-                        result = crew.kickoff()
-                        # --- Token usage tracing for Phoenix ---
-                        usage = None
-                        if isinstance(result, dict) and "token_usage" in result:
-                            u = result["token_usage"]                 # UsageMetrics object
-                            usage = {
-                                "prompt_tokens":     u.prompt_tokens,
-                                "completion_tokens": u.completion_tokens,
-                                "total_tokens":      u.total_tokens,
-                            }
-                        elif hasattr(result, "token_usage"):          # CrewOutput object
-                            u = result.token_usage
-                            usage = {
-                                "prompt_tokens":     u.prompt_tokens,
-                                "completion_tokens": u.completion_tokens,
-                                "total_tokens":      u.total_tokens,
-                            }
-                        if usage:
-                            try:
-                                span.set_attribute("token.usage.prompt",     int(usage.get("prompt_tokens", 0)))
-                                span.set_attribute("token.usage.completion", int(usage.get("completion_tokens", 0)))
-                                span.set_attribute("token.usage.total",      int(usage.get("total_tokens", 0)))
-                                print("Set Phoenix token attributes:", usage)
-                            except Exception as e:
-                                print("Error setting Phoenix token attributes:", e, usage)
-                        # --- End token usage tracing ---
-                        span.set_status(Status(StatusCode.OK))
-                    except Exception as e:
-                        span.set_status(Status(StatusCode.ERROR, str(e)))
-                        st.error(f"Agent execution error: {e}")
-                        import traceback
-                        traceback.print_exc()
-                        return
-                
-                # Parse the result
+            status = st.status("Generating your travel plan...", expanded=False)
+            status.update(label="Gathering weather, safety and events...")
+            trip_context = orjson.dumps(
+                _prefetch_trip_context(travel_input.destination, trip_dates),
+                default=str
+            ).decode()
+            travel_expert = get_agents().travel_planning_expert()
+            task = Task(
+                description=_TRAVEL_TASK_TEMPLATE.format(
+                    preferences=preferences_json, conditions=trip_context
+                ),
+                expected_output="JSON travel plan with destination, itinerary, budget_breakdown and recommendations.",
+                agent=travel_expert
+            )
+            crew = Crew(
+                agents=[travel_expert],
+                tasks=[task]
+            )
+            with tracer.start_as_current_span("travel_plan_generation_task") as span:  # ✅ Tracing block added
+                span.set_attribute("destination", travel_input.destination)
+                span.set_attribute("duration_days", len(trip_dates) - 1)
+                span.set_attribute("activities", str(activities))
                 try:
-                    # Extract raw text from the result
-                    if hasattr(result, 'raw'):
-                        raw_text = result.raw
-                    elif isinstance(result, str):
-                        raw_text = result
-                    else:
-                        raw_text = str(result)
-                    
-                    result_data = json.loads(raw_text)
-                # Validate output using guardrails
-                #try:
-                    #result_data = json.loads(result)
-                    is_valid, error_message = guardrails.validate_output(result_data, "travel_plan")
-                    if not is_valid:
-                        st.error(error_message)
-                        return
-                    
-                    # Validate business rules
-                    is_valid, error_message = guardrails.validate_business_rules(result_data)
-                    if not is_valid:
-                        st.error(error_message)
-                        return
-                    
-                    st.session_state.travel_plan = result_data
-                    display_travel_plan(st.session_state.travel_plan)
-                except json.JSONDecodeError:
-                    st.error("Invalid response format from the AI. Please try again.")
+                    status.update(label="Asking the travel planning expert...")
+                    result = crew.kickoff()
+                    # --- Token usage tracing for Phoenix ---
+                    usage = None
+                    if isinstance(result, dict) and "token_usage" in result:
+                        u = result["token_usage"]                 # UsageMetrics object
+                        usage = {
+                            "prompt_tokens":     u.prompt_tokens,
+                            "completion_tokens": u.completion_tokens,
+                            "total_tokens":      u.total_tokens,
+                        }
+                    elif hasattr(result, "token_usage"):          # CrewOutput object
+                        u = result.token_usage
+                        usage = {
+                            "prompt_tokens":     u.prompt_tokens,
+                            "completion_tokens": u.completion_tokens,
+                            "total_tokens":      u.total_tokens,
+                        }
+                    if usage:
+                        try:
+                            span.set_attribute("token.usage.prompt",     int(usage.get("prompt_tokens", 0)))
+                            span.set_attribute("token.usage.completion", int(usage.get("completion_tokens", 0)))
+                            span.set_attribute("token.usage.total",      int(usage.get("total_tokens", 0)))
+                            print("Set Phoenix token attributes:", usage)
+                        except Exception as e:
+                            print("Error setting Phoenix token attributes:", e, usage)
+                    # --- End token usage tracing ---
+                    span.set_status(Status(StatusCode.OK))
+                except Exception as e:
+                    span.set_status(Status(StatusCode.ERROR, str(e)))
+                    status.update(label="Agent execution failed", state="error")
+                    st.error(f"Agent execution error: {e}")
+                    import traceback
+                    traceback.print_exc()
+                    return
+            
+            # Parse the result
+            try:
+                # Extract raw text from the result
+                if hasattr(result, 'raw'):
+                    raw_text = result.raw
+                elif isinstance(result, str):
+                    raw_text = result
+                else:
+                    raw_text = str(result)
+                
+                status.update(label="Validating travel plan...")
+                result_data = orjson.loads(raw_text)
+            # Validate output using guardrails
+            #try:
+                #result_data = json.loads(result)
+                is_valid, error_message = get_guardrails().validate_output(result_data, "travel_plan")
+                if not is_valid:
+                    status.update(label="Travel plan failed validation", state="error")
+                    st.error(error_message)
+                    return
+                
+                # Validate business rules
+                is_valid, error_message = get_guardrails().validate_business_rules(result_data)
+                if not is_valid:
+                    status.update(label="Travel plan failed validation", state="error")
+                    st.error(error_message)
+                    return
+                
+                st.session_state.travel_plan = result_data
+                status.update(label="Travel plan ready", state="complete")
+            except orjson.JSONDecodeError:
+                status.update(label="Could not parse travel plan", state="error")
+                st.error("Invalid response format from the AI. Please try again.")
+
+    # Streamlit forbids st.download_button inside a form, so the plan and its
+    # export options are shown from session state once the form is closed
+    if st.session_state.travel_plan:
+        display_travel_plan(st.session_state.travel_plan)
 
 def main():
 
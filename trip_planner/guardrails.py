@@ -1,8 +1,41 @@
 from typing import Dict, List, Any, Optional
 from pydantic import BaseModel, Field, validator
-from datetime import datetime, timedelta
+from datetime import date
 import re
 
+# HTML tags, URLs and special characters, stripped in one scan by sanitize_description
+_SANITIZE_RE = re.compile(r'<[^>]+>|https?://\S+|[^\w\s.,!?-]')
+# Case-insensitive, so text is scanned in place without a lowercased copy
+_SENSITIVE_RE = re.compile(r'illegal|drugs|weapons|explicit|offensive|discriminatory', re.IGNORECASE)
+# Cheap shape check so malformed dates are rejected without raising ValueError
+_ISO_DATE_RE = re.compile(r'\d{4}-\d{2}-\d{2}')
+
+# Field and value sets checked by the guardrails, built once at import
+_ALLOWED_PREFERENCES = frozenset({
+    "Beach", "Mountains", "City Life", "Culture", "Food",
+    "Adventure", "Relaxation", "Nightlife"
+})
+_CITY_FIELDS = frozenset({
+    "name", "country", "description", "match_score",
+    "highlights", "estimated_cost"
+})
+_PLAN_FIELDS = frozenset({"itinerary", "budget_breakdown", "recommendations"})
+_DAY_FIELDS = frozenset({"day", "date", "activities", "meals"})
+_COST_FIELDS = frozenset({"accommodation", "food", "activities", "transportation", "total"})
+
+def _iter_strings(data: Any):
+    """Yield every string key and value in nested dicts and lists"""
+    if isinstance(data, str):
+        yield data
+    elif isinstance(data, dict):
+        for key, value in data.items():
+            if isinstance(key, str):
+                yield key
+            yield from _iter_strings(value)
+    elif isinstance(data, (list, tuple)):
+        for item in data:
+            yield from _iter_strings(item)
+
 class InputGuardrails:
     @staticmethod
     def validate_budget(budget: float) -> bool:
@@ -17,15 +50,16 @@ class InputGuardrails:
     @staticmethod
     def validate_dates(start_date: str, end_date: str) -> bool:
         """Validate that the dates are valid and in the future"""
+        if not (_ISO_DATE_RE.fullmatch(start_date) and _ISO_DATE_RE.fullmatch(end_date)):
+            return False
         try:
-            start = datetime.strptime(start_date, "%Y-%m-%d")
-            end = datetime.strptime(end_date, "%Y-%m-%d")
-            today = datetime.now().date()
+            start = date.fromisoformat(start_date)
+            end = date.fromisoformat(end_date)
             
             return (
-                start.date() >= today and
-                end.date() >= start.date() and
-                (end.date() - start.date()).days <= 90
+                start >= date.today() and
+                end >= start and
+                (end - start).days <= 90
             )
         except ValueError:
             return False
@@ -33,62 +67,39 @@ class InputGuardrails:
     @staticmethod
     def validate_preferences(preferences: List[str]) -> bool:
         """Validate that the preferences are from the allowed list"""
-        allowed_preferences = {
-            "Beach", "Mountains", "City Life", "Culture", "Food",
-            "Adventure", "Relaxation", "Nightlife"
-        }
-        return all(pref in allowed_preferences for pref in preferences)
+        return _ALLOWED_PREFERENCES.issuperset(preferences)
 
 class OutputGuardrails:
     @staticmethod
     def validate_city_recommendation(city: Dict[str, Any]) -> bool:
         """Validate that a city recommendation has all required fields"""
-        required_fields = {
-            "name", "country", "description", "match_score",
-            "highlights", "estimated_cost"
-        }
-        return all(field in city for field in required_fields)
+        return isinstance(city, dict) and city.keys() >= _CITY_FIELDS
 
     @staticmethod
     def validate_travel_plan(plan: Dict[str, Any]) -> bool:
         """Validate that a travel plan has all required fields"""
-        required_fields = {"itinerary", "budget_breakdown", "recommendations"}
-        if not all(field in plan for field in required_fields):
-            return False
-            
-        # Validate itinerary
-        for day in plan["itinerary"]:
-            if not all(field in day for field in ["day", "date", "activities", "meals"]):
-                return False
-                
-        # Validate budget breakdown
-        required_costs = {"accommodation", "food", "activities", "transportation", "total"}
-        if not all(cost in plan["budget_breakdown"] for cost in required_costs):
-            return False
-            
-        return True
+        # Malformed LLM output fails the shape checks instead of raising
+        return (
+            isinstance(plan, dict) and
+            plan.keys() >= _PLAN_FIELDS and
+            isinstance(plan["itinerary"], list) and
+            # Every itinerary day carries its fields
+            all(isinstance(day, dict) and day.keys() >= _DAY_FIELDS for day in plan["itinerary"]) and
+            # Budget breakdown covers every category
+            isinstance(plan["budget_breakdown"], dict) and
+            plan["budget_breakdown"].keys() >= _COST_FIELDS
+        )
 
     @staticmethod
     def sanitize_description(text: str) -> str:
         """Remove potentially harmful content from descriptions"""
-        # Remove HTML tags
-        text = re.sub(r'<[^>]+>', '', text)
-        # Remove URLs
-        text = re.sub(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', '', text)
-        # Remove special characters
-        text = re.sub(r'[^\w\s.,!?-]', '', text)
-        return text.strip()
+        return _SANITIZE_RE.sub('', text).strip()
 
 class SafetyGuardrails:
     @staticmethod
     def check_sensitive_content(text: str) -> bool:
         """Check for potentially sensitive or inappropriate content"""
-        sensitive_keywords = {
-            "illegal", "drugs", "weapons", "explicit",
-            "offensive", "discriminatory"
-        }
-        text_lower = text.lower()
-        return not any(keyword in text_lower for keyword in sensitive_keywords)
+        return _SENSITIVE_RE.search(text) is None
 
     @staticmethod
     def validate_location_safety(location: str) -> bool:
@@ -156,9 +167,10 @@ class GuardrailManager:
                 output_data["description"]
             )
             
-        # Check for sensitive content
-        if not self.safety_guardrails.check_sensitive_content(
-            json.dumps(output_data)
+        # Check for sensitive content string by string, stopping at the first hit
+        if not all(
+            self.safety_guardrails.check_sensitive_content(text)
+            for text in _iter_strings(output_data)
         ):
             return False, "Output contains sensitive content"
             
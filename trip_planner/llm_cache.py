@@ -0,0 +1,48 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+
+class MemoryCache:
+    """Thread-safe exact-match LRU cache bounded by the approximate size of its values.
+
+    Entries stored with a ``ttl`` expire that many seconds after they are set.
+    """
+
+    def __init__(self, max_size_mb: float = 256):
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self._entries: "OrderedDict[str, Tuple[Any, int, Optional[float]]]" = OrderedDict()
+        self._size_bytes = 0
+        self._lock = threading.RLock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss or once it has expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, size, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._entries[key]
+                self._size_bytes -= size
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value, evicting least recently used entries when over budget"""
+        size = len(json.dumps(value, default=str))
+        if size > self.max_size_bytes:
+            return
+
+        expires_at = time.time() + ttl if ttl is not None else None
+        with self._lock:
+            if key in self._entries:
+                self._size_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size, expires_at)
+            self._size_bytes += size
+            while self._size_bytes > self.max_size_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._size_bytes -= evicted_size
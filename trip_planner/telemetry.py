@@ -1,27 +1,43 @@
 import os
-import logging
+from functools import lru_cache
 from opentelemetry import trace
-from opentelemetry.sdk.trace import TracerProvider
-from opentelemetry.sdk.trace.export import ConsoleSpanExporter
-from opentelemetry.sdk.trace.export import BatchSpanProcessor
 
+PHOENIX_PROJECT_NAME = "crewAI-trip-planner"
+
+@lru_cache(maxsize=1)
 def setup_telemetry():
-    """Setup OpenTelemetry with Phoenix integration"""
+    """Setup OpenTelemetry with Phoenix integration.
+
+    Tracing is opt-in: spans are only exported when PHOENIX_COLLECTOR_ENDPOINT
+    is set and Phoenix is installed. Otherwise the current (by default no-op)
+    tracer provider is returned unchanged. Cached so that registration and LLM
+    instrumentation happen once per process.
+    """
+    endpoint = os.getenv("PHOENIX_COLLECTOR_ENDPOINT")
+    if not endpoint:
+        # Tracing used to be on by default; say why spans stopped appearing
+        print("Phoenix tracing disabled: set PHOENIX_COLLECTOR_ENDPOINT "
+              "(e.g. https://your-phoenix-host/v1/traces) to export spans.")
+        return trace.get_tracer_provider()
+
     try:
-        # Get the current tracer provider (should be set by Phoenix in streamlit_app.py)
-        tracer_provider = trace.get_tracer_provider()
-        
-        if tracer_provider is None:
-            # Fallback to console tracing if Phoenix setup failed
-            tracer_provider = TracerProvider()
-            tracer_provider.add_span_processor(
-                BatchSpanProcessor(ConsoleSpanExporter())
-            )
-            trace.set_tracer_provider(tracer_provider)
-            print("Using console tracing (Phoenix not configured)")
-        
+        from phoenix.otel import register
+        from openinference.instrumentation.litellm import LiteLLMInstrumentor
+        from openinference.instrumentation.langchain import LangChainInstrumentor
+
+        # batch=True keeps span export off the request path
+        tracer_provider = register(
+            project_name=PHOENIX_PROJECT_NAME,
+            endpoint=endpoint,
+            auto_instrument=True,
+            batch=True
+        )
+        # auto_instrument may already have covered these; never instrument twice
+        for instrumentor in (LiteLLMInstrumentor(), LangChainInstrumentor()):
+            if not instrumentor.is_instrumented_by_opentelemetry:
+                instrumentor.instrument()
         return tracer_provider
 
     except Exception as e:
-        print(f"Failed to setup telemetry: {str(e)}")
-        return None 
\ No newline at end of file
+        print(f"Failed to setup Phoenix telemetry: {str(e)}")
+        return trace.get_tracer_provider()
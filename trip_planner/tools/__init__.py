@@ -10,7 +10,9 @@ from .travel_tools import (
     RestaurantRecommendationsTool,
     AccommodationOptionsTool,
     MatchScoreTool,
-    GeocodeTool
+    MatchScoreBatchTool,
+    GeocodeTool,
+    get_travel_tools
 )
 
 __all__ = [
@@ -24,6 +26,8 @@ __all__ = [
     'RestaurantRecommendationsTool',
     'AccommodationOptionsTool',
     'MatchScoreTool',
-    'GeocodeTool'
+    'MatchScoreBatchTool',
+    'GeocodeTool',
+    'get_travel_tools'
 ]
 
@@ -0,0 +1,94 @@
+import functools
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Tuple
+
+import orjson
+
+
+def _normalize(value: Any) -> Any:
+    """Normalize tool arguments so trivially different calls share a cache key"""
+    if isinstance(value, str):
+        return value.strip().lower()
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def _ttl_lru(maxsize: int, ttl: float, key_parts: Callable[..., list],
+             cache_if: Callable[[Any], bool]):
+    """Build a decorator backed by a thread-safe LRU whose entries expire after ttl seconds"""
+    def decorator(func: Callable) -> Callable:
+        entries: "OrderedDict[bytes, Tuple[float, Any]]" = OrderedDict()
+        lock = threading.Lock()
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = hashlib.blake2b(
+                orjson.dumps(
+                    _normalize(key_parts(*args, **kwargs)),
+                    option=orjson.OPT_SORT_KEYS,
+                    default=str
+                ),
+                digest_size=16
+            ).digest()
+
+            now = time.monotonic()
+            with lock:
+                entry = entries.get(key)
+                if entry is not None:
+                    if entry[0] > now:
+                        entries.move_to_end(key)
+                        return entry[1]
+                    del entries[key]
+
+            result = func(*args, **kwargs)
+            if not cache_if(result):
+                return result
+
+            with lock:
+                entries[key] = (now + ttl, result)
+                entries.move_to_end(key)
+                while len(entries) > maxsize:
+                    entries.popitem(last=False)
+            return result
+
+        wrapper.cache_clear = lambda: entries.clear()
+        return wrapper
+    return decorator
+
+
+def cached_tool(maxsize: int = 1024, ttl: float = 3600):
+    """Cache a tool's ``_run`` results in an LRU keyed on its normalized arguments.
+
+    The cache is shared by every instance of the tool, so agents in the same
+    process reuse each other's results. Error strings are never cached; tools
+    that answer failures with placeholder data must not use this decorator, and
+    should instead cache a raising lookup with ``cached_call`` and fall back
+    outside it.
+    """
+    return _ttl_lru(
+        maxsize, ttl,
+        key_parts=lambda self, *args, **kwargs: [type(self).__name__, args, kwargs],
+        cache_if=lambda result: not (isinstance(result, str) and result.startswith("Error"))
+    )
+
+
+def cached_call(maxsize: int = 1024, ttl: float = 3600,
+                cache_if: Optional[Callable[[Any], bool]] = None):
+    """Cache a plain function's results in an LRU keyed on its normalized arguments.
+
+    Exceptions propagate and are never cached; pass ``cache_if`` to also skip
+    caching results that only signal a soft failure.
+    """
+    def decorator(func: Callable) -> Callable:
+        return _ttl_lru(
+            maxsize, ttl,
+            key_parts=lambda *args, **kwargs: [func.__qualname__, args, kwargs],
+            cache_if=cache_if or (lambda result: True)
+        )(func)
+    return decorator
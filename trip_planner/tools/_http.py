@@ -0,0 +1,98 @@
+import functools
+import threading
+import time
+from typing import Dict, Set, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# (connect, read) timeout applied to every tool request
+DEFAULT_TIMEOUT = (3, 8)
+
+# Consecutive failures before a host's circuit opens, and how long it stays open
+BREAKER_THRESHOLD = 3
+BREAKER_COOLDOWN = 30.0
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Raised instead of sending a request to a host whose circuit is open"""
+
+
+class _BreakerSession(requests.Session):
+    """Session that stops calling a host for a while after repeated failures.
+
+    Timeouts, connection errors and 5xx responses count as failures; any other
+    response closes the circuit again. While a host's circuit is open, requests
+    to it fail immediately so the tools fall back without waiting on a timeout.
+    Once the cooldown has passed the circuit is half-open: exactly one probe
+    request is let through, and other callers keep failing fast until it
+    closes the circuit or opens it for another cooldown.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._hosts: Dict[str, Tuple[int, float]] = {}
+        self._probing: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def request(self, method, url, *args, **kwargs):
+        host = urlsplit(url).netloc
+        probe = self._admit(host)
+
+        kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+        failed = True
+        try:
+            response = super().request(method, url, *args, **kwargs)
+            failed = response.status_code >= 500
+            return response
+        finally:
+            self._record(host, failed, probe)
+
+    def _admit(self, host: str) -> bool:
+        """Raise if host's circuit is open; return True when this request is the half-open probe"""
+        with self._lock:
+            open_until = self._hosts.get(host, (0, 0.0))[1]
+            if not open_until:
+                return False
+            if open_until > time.monotonic() or host in self._probing:
+                raise CircuitOpenError(f"Circuit open for {host}, skipping request")
+            self._probing.add(host)
+            return True
+
+    def _record(self, host: str, failed: bool, probe: bool) -> None:
+        """Close host's circuit on success, or count a failure and open it once the threshold is hit"""
+        with self._lock:
+            if probe:
+                self._probing.discard(host)
+            if not failed:
+                self._hosts.pop(host, None)
+                return
+            failures = self._hosts.get(host, (0, 0.0))[0] + 1
+            open_until = time.monotonic() + BREAKER_COOLDOWN if failures >= BREAKER_THRESHOLD else 0.0
+            self._hosts[host] = (failures, open_until)
+
+
+@functools.lru_cache(maxsize=1)
+def get_session() -> requests.Session:
+    """Shared keep-alive session for the travel tools' API calls.
+
+    Connections to the same host are pooled across tools and threads, and
+    transient failures (429 and 5xx) are retried with a short backoff. Hosts
+    that keep failing are short-circuited by a per-host circuit breaker.
+    """
+    session = _BreakerSession()
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=32,
+        max_retries=Retry(
+            total=2,
+            backoff_factor=0.2,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=frozenset({"GET"})
+        )
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
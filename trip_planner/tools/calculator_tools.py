@@ -1,7 +1,41 @@
+import ast
+import operator as op
+from functools import lru_cache
 from typing import Type
 from pydantic import BaseModel, Field
 from crewai.tools import BaseTool
 
+_OPS = {
+    ast.Add: op.add,
+    ast.Sub: op.sub,
+    ast.Mult: op.mul,
+    ast.Div: op.truediv,
+    ast.FloorDiv: op.floordiv,
+    ast.Mod: op.mod,
+    ast.Pow: op.pow,
+    ast.USub: op.neg,
+    ast.UAdd: op.pos,
+}
+_FUNCS = {"abs": abs, "round": round}
+
+def _eval_node(node: ast.AST):
+    """Evaluate an arithmetic AST node, rejecting anything but numbers, operators, abs and round"""
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+        return node.value
+    if isinstance(node, ast.BinOp) and type(node.op) in _OPS:
+        return _OPS[type(node.op)](_eval_node(node.left), _eval_node(node.right))
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _OPS:
+        return _OPS[type(node.op)](_eval_node(node.operand))
+    if (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+            and node.func.id in _FUNCS and not node.keywords):
+        return _FUNCS[node.func.id](*(_eval_node(arg) for arg in node.args))
+    raise ValueError(f"Unsupported expression element: {type(node).__name__}")
+
+@lru_cache(maxsize=512)
+def _evaluate(expression: str):
+    """Parse and evaluate an arithmetic expression, memoized by its source text"""
+    return _eval_node(ast.parse(expression.strip(), mode="eval").body)
+
 class CalculatorInput(BaseModel):
     """Input schema for CalculatorTool."""
     expression: str = Field(..., description="The mathematical expression to evaluate")
@@ -14,7 +48,6 @@ class CalculatorTool(BaseTool):
     def _run(self, expression: str) -> str:
         """Safely evaluate a math expression."""
         try:
-            result = eval(expression, {"__builtins__": {}}, {"abs": abs, "round": round})
-            return str(result)
+            return str(_evaluate(expression))
         except Exception as e:
-            return f"Error calculating expression: {str(e)}"
\ No newline at end of file
+            return f"Error calculating expression: {str(e)}"
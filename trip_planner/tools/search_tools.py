@@ -1,9 +1,22 @@
 from typing import Type
 from pydantic import BaseModel, Field
 from crewai.tools import BaseTool
-import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 import json
+from trip_planner.tools._cache import cached_tool
+from trip_planner.tools._http import DEFAULT_TIMEOUT, get_session
+
+# Only result blocks are built into the tree; the rest of the page is skipped while parsing
+_RESULT_BLOCKS = SoupStrainer('div', attrs={'class': 'g'})
+
+# Sent per request so the shared session's headers stay untouched for other APIs
+_HEADERS = {
+    'User-Agent': (
+        'Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
+        'AppleWebKit/537.36 (KHTML, like Gecko) '
+        'Chrome/91.0.4472.124 Safari/537.36'
+    )
+}
 
 class SearchInput(BaseModel):
     """Input for search tool."""
@@ -14,18 +27,17 @@ class SearchInternetTool(BaseTool):
     description: str = "Search the internet for the given query and return top results."
     args_schema: Type[BaseModel] = SearchInput
 
+    @cached_tool()
     def _run(self, query: str) -> str:
         """Perform the search logic."""
         try:
-            headers = {
-                'User-Agent': (
-                    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
-                    'AppleWebKit/537.36 (KHTML, like Gecko) '
-                    'Chrome/91.0.4472.124 Safari/537.36'
-                )
-            }
-            response = requests.get(f"https://www.google.com/search?q={query}", headers=headers)
-            soup = BeautifulSoup(response.text, 'html.parser')
+            response = get_session().get(
+                "https://www.google.com/search",
+                params={"q": query},
+                headers=_HEADERS,
+                timeout=DEFAULT_TIMEOUT
+            )
+            soup = BeautifulSoup(response.text, 'html.parser', parse_only=_RESULT_BLOCKS)
 
             # Extract simplified top 5 results
             results = []